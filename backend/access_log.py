@@ -0,0 +1,79 @@
+"""
+샘플링 기반 비동기 접근 로그
+요청 처리 경로에서는 큐에 기록만 하고, 실제 출력은 별도 스레드(QueueListener)가 담당합니다.
+정적 파일 요청은 파일시스템 접근 없이 샘플링 비율에 따라 일부만 기록합니다.
+"""
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+from db_pool import env_bool
+
+ACCESS_LOG_ENABLED = env_bool("ACCESS_LOG_ENABLED", True)
+# 기록 비율 (0.0 ~ 1.0) - 정적 파일은 이미지 수십 개씩 요청되므로 기본값을 낮게 설정
+ACCESS_LOG_STATIC_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_STATIC_SAMPLE_RATE", "0.01"))
+ACCESS_LOG_API_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_API_SAMPLE_RATE", "1.0"))
+# 오류 응답(4xx/5xx)은 샘플링과 관계없이 항상 기록
+ACCESS_LOG_ALWAYS_ERRORS = env_bool("ACCESS_LOG_ALWAYS_ERRORS", True)
+# 큐가 가득 차면 로그를 버려서 요청 처리가 막히지 않도록 함
+ACCESS_LOG_QUEUE_SIZE = int(os.getenv("ACCESS_LOG_QUEUE_SIZE", "10000"))
+
+STATIC_PREFIXES = ("/static/", "/gallery/")
+
+logger = logging.getLogger("access")
+logger.propagate = False
+
+_listener = None
+dropped_records = 0
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def enqueue(self, record):
+        global dropped_records
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records += 1
+
+
+def start_access_log():
+    """로그 출력 스레드 시작 (애플리케이션 시작 시 1회)"""
+    global _listener
+    if _listener is not None or not ACCESS_LOG_ENABLED:
+        return
+    log_queue = queue.Queue(maxsize=ACCESS_LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(logging.Formatter("%(asctime)s - access - %(message)s"))
+    logger.addHandler(_NonBlockingQueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+
+
+def stop_access_log():
+    """남은 로그를 모두 출력하고 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _sample_rate(path: str) -> float:
+    if path.startswith(STATIC_PREFIXES):
+        return ACCESS_LOG_STATIC_SAMPLE_RATE
+    return ACCESS_LOG_API_SAMPLE_RATE
+
+
+def log_request(method: str, path: str, status_code: int, duration_ms: float, client: str = "-"):
+    """요청 한 건 기록 (샘플링 대상이 아니면 아무 일도 하지 않음)"""
+    if _listener is None:
+        return
+    is_error = status_code >= 400
+    if not (is_error and ACCESS_LOG_ALWAYS_ERRORS):
+        rate = _sample_rate(path)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return
+    logger.info("%s %s %s %d %.1fms", client, method, path, status_code, duration_ms)
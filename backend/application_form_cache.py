@@ -0,0 +1,138 @@
+"""
+신청 양식 캐시
+게시판/갤러리/지원 페이지가 열릴 때마다 조회하는 신청 양식, 지원 가능 여부, 파싱된 질문 목록을
+프로세스 메모리에 보관합니다. 이 프로세스에서 양식을 바꾸면 즉시 갱신(write-through)하고,
+다른 인스턴스에서 바뀐 내용은 짧은 TTL이 지나면 다시 읽습니다.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from models import ApplicationForm
+from schemas import json_text
+
+# 캐시 유지 시간 (초) - 다른 인스턴스에서 변경한 내용이 반영되기까지의 최대 지연
+APPLICATION_FORM_CACHE_TTL = float(os.getenv("APPLICATION_FORM_CACHE_TTL", "30"))
+# 브라우저 캐시 시간 (Cache-Control max-age, 초)
+APPLICATION_FORM_MAX_AGE = int(os.getenv("APPLICATION_FORM_MAX_AGE", "5"))
+
+CACHE_CONTROL = f"public, max-age={APPLICATION_FORM_MAX_AGE}, stale-while-revalidate={APPLICATION_FORM_MAX_AGE * 6}"
+
+_FORM_FIELDS = (
+    "id", "is_active", "max_applicants", "current_applicants", "form_questions",
+    "created_at", "updated_at", "updated_by",
+)
+
+
+def _form_to_dict(form: Optional[ApplicationForm]) -> Optional[dict]:
+    if form is None:
+        return None
+    data = {field: getattr(form, field) for field in _FORM_FIELDS}
+    # 응답용 JSON 문자열은 캐시할 때 한 번만 만듦
+    data["form_questions"] = json_text(form.form_questions)
+    return data
+
+
+def _questions(form: Optional[ApplicationForm]) -> list:
+    if form is None or not isinstance(form.form_questions, list):
+        return []
+    return form.form_questions
+
+
+class ApplicationFormCache:
+    """최신 양식 / 활성 양식 / 질문 목록 스냅샷"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot: Optional[dict] = None
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.loads = 0
+
+    def _load(self, db: Session) -> dict:
+        # 최신 양식(조회/질문용)과 활성 양식(지원 가능 여부용)을 함께 읽음
+        latest = db.query(ApplicationForm).order_by(ApplicationForm.id.desc()).first()
+        active = db.query(ApplicationForm).filter(ApplicationForm.is_active == True).first()
+        fallback = db.query(ApplicationForm).first() if active is None else None
+        return {
+            "latest": _form_to_dict(latest),
+            "active": _form_to_dict(active),
+            "fallback": _form_to_dict(fallback),
+            "questions": _questions(latest),
+        }
+
+    def get(self, db: Session) -> dict:
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl:
+                self.hits += 1
+                return self._snapshot
+            self.loads += 1
+            self._snapshot = self._load(db)
+            self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        """양식/질문/지원자 수를 바꾼 뒤 호출"""
+        with self._lock:
+            self._snapshot = None
+
+    def record_admission(self, form_id: int, current_applicants: int):
+        """지원자 수가 증가한 뒤 호출 - 다시 읽지 않고 캐시된 값만 갱신
+
+        동시에 커밋된 지원은 어떤 순서로든 여기에 도착하므로 더 큰 값만 반영
+        (지원자 수 초기화는 캐시를 무효화하므로 값이 줄어드는 경우는 없음)
+        """
+        with self._lock:
+            if self._snapshot is None:
+                return
+            for key in ("latest", "active", "fallback"):
+                form = self._snapshot[key]
+                if form is not None and form["id"] == form_id:
+                    admitted = max(form["current_applicants"] or 0, current_applicants)
+                    self._snapshot[key] = {**form, "current_applicants": admitted}
+
+    def status(self, db: Session) -> dict:
+        """지원 가능 여부"""
+        snapshot = self.get(db)
+        form = snapshot["active"]
+        if form is None:
+            inactive_form = snapshot["fallback"]
+            if inactive_form:
+                return {
+                    "can_apply": False,
+                    "reason": "지금은 모집 기간이 아닙니다.",
+                    "max_applicants": inactive_form["max_applicants"],
+                    "current_applicants": inactive_form["current_applicants"] or 0
+                }
+            return {
+                "can_apply": False,
+                "reason": "지원 양식이 설정되지 않았습니다.",
+                "max_applicants": 0,
+                "current_applicants": 0
+            }
+
+        # 저장된 지원자 수 사용 (초기화 기능을 위해)
+        current_count = form["current_applicants"]
+        if form["max_applicants"] > 0 and current_count >= form["max_applicants"]:
+            return {
+                "can_apply": False,
+                "reason": f"선착순 지원이 마감되었습니다. (현재: {current_count}/{form['max_applicants']})",
+                "max_applicants": form["max_applicants"],
+                "current_applicants": current_count
+            }
+        return {
+            "can_apply": True,
+            "reason": "지원 가능합니다.",
+            "max_applicants": form["max_applicants"],
+            "current_applicants": current_count
+        }
+
+    def stats(self) -> dict:
+        return {"ttl_seconds": self.ttl, "hits": self.hits, "loads": self.loads}
+
+
+application_form_cache = ApplicationFormCache(APPLICATION_FORM_CACHE_TTL)
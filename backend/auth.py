@@ -1,17 +1,45 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import os
+import secrets
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from database import get_db
-from models import User
+from models import User, RefreshToken
+from ttl_cache import TTLCache
+from password_pool import run_in_password_pool
+from token_versions import TokenVersionMap
 
 # JWT 설정
 SECRET_KEY = "eumsaem-band-secret-key-2024"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# 리프레시 토큰 유효 기간 (사용할 때마다 새 토큰으로 교체됨)
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# 교체된 토큰이 이 시간(초) 안에 다시 쓰이면 동시 요청(여러 탭)으로 보고 계열 전체를 폐기하지 않음
+REFRESH_TOKEN_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "10"))
+
+# 검증된 토큰 클레임 캐시 (토큰 다이제스트 -> 클레임, 토큰의 exp까지 유지)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+
+# 현재 사용자 캐시 (이메일 -> 분리된 User 사본, 짧은 TTL + 변경 시 명시적 무효화)
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1000"))
+user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+
+# 토큰 버전 맵 (다른 프로세스에서 올린 버전은 이 주기(초) 안에 반영)
+TOKEN_VERSION_REFRESH_SECONDS = float(os.getenv("TOKEN_VERSION_REFRESH_SECONDS", "30"))
+token_versions = TokenVersionMap(
+    refresh_seconds=TOKEN_VERSION_REFRESH_SECONDS,
+    maxsize=int(os.getenv("TOKEN_VERSION_MAP_SIZE", "50000"))
+)
 
 # 비밀번호 해싱
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -29,6 +57,14 @@ def get_password_hash(password: str) -> str:
     """비밀번호 해싱"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """비밀번호 검증 (해싱 워커 풀에서 실행 - 이벤트 루프를 막지 않음)"""
+    return await run_in_password_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """비밀번호 해싱 (해싱 워커 풀에서 실행 - 이벤트 루프를 막지 않음)"""
+    return await run_in_password_pool(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """액세스 토큰 생성"""
     to_encode = data.copy()
@@ -40,46 +76,175 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """토큰 검증 및 이메일 추출"""
+def create_user_access_token(user: User) -> str:
+    """사용자 액세스 토큰 생성 - 권한 판단에 필요한 정보(id, 승인/관리자 여부, 토큰 버전) 포함"""
+    return create_access_token(data={
+        "sub": user.email,
+        "uid": user.id,
+        "apr": bool(user.is_approved),
+        "adm": bool(user.is_admin),
+        "ver": user.token_version or 0
+    })
+
+def hash_refresh_token(token: str) -> str:
+    """리프레시 토큰 저장/조회용 해시"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def create_refresh_token(user_id: int, family_id: Optional[str] = None):
+    """리프레시 토큰 생성 - (클라이언트에 줄 원본 토큰, DB에 저장할 RefreshToken) 반환"""
+    token = secrets.token_urlsafe(32)
+    db_token = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return token, db_token
+
+def revoke_refresh_tokens(db: Session, user_id: int):
+    """사용자의 모든 리프레시 토큰 폐기 (비밀번호 변경/삭제 시 - 커밋은 호출한 쪽에서)"""
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+
+def _token_digest(token: str) -> str:
+    # 원본 토큰을 메모리에 키로 보관하지 않도록 해시 사용
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def decode_token(token: str) -> Optional[dict]:
+    """토큰 서명/만료 검증 후 클레임 반환 (검증 결과는 exp까지 캐시)"""
+    key = _token_digest(token)
+    claims = token_cache.get(key)
+    if claims is not None:
+        return claims
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)) and exp > time.time():
+        token_cache.set(key, claims, expires_at=exp)
+    return claims
+
+def verify_token(token: str) -> Optional[str]:
+    """토큰 검증 및 이메일 추출"""
+    claims = decode_token(token)
+    if claims is None:
+        return None
+    email: str = claims.get("sub")
+    if email is None:
+        return None
+    return email
+
+def _detached_copy(user: User) -> User:
+    # 세션과 무관한 사본을 캐시에 보관 (원본은 요청 세션에 그대로 둠)
+    copy = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    cached = user_cache.get(email)
+    if cached is not None:
+        # SELECT 없이 현재 세션에 연결 (이후 수정/커밋은 이 세션으로 처리됨)
+        return db.merge(cached, load=False)
+    user = db.query(User).filter(
+        User.email == email,
+        User.is_deleted == False
+    ).first()
+    if user is not None:
+        user_cache.set(email, _detached_copy(user))
+    return user
+
+def _get_user_for_claims(db: Session, claims: dict) -> Optional[User]:
+    """토큰 주인 조회 - 토큰 버전이 캐시된 사용자보다 새로우면 캐시를 버리고 DB에서 다시 조회"""
+    email = claims["sub"]
+    user = _get_user_by_email(db, email)
+    if user is not None and claims.get("ver", 0) > (user.token_version or 0):
+        # 다른 프로세스에서 승인/권한 변경 후 발급된 토큰 - 이 프로세스의 캐시가 오래됨
+        user_cache.delete(email)
+        db.expunge(user)
+        user = _get_user_by_email(db, email)
+    return user
+
+def invalidate_cached_user(email: str, user_id: Optional[int] = None, token_version: Optional[int] = None):
+    """사용자 정보/권한/삭제 상태가 바뀐 뒤 호출 - 다음 요청에서 DB를 다시 조회"""
+    user_cache.delete(email)
+    if user_id is not None and token_version is not None:
+        token_versions.set(user_id, token_version)
+
+def bump_token_version(user: User) -> int:
+    """승인/권한 변경/삭제 시 커밋 전에 호출 - 이전에 발급된 토큰을 무효화"""
+    user.token_version = (user.token_version or 0) + 1
+    return user.token_version
+
+def _load_token_version(db: Session, user_id: int) -> Optional[int]:
+    row = db.query(User.token_version, User.is_deleted).filter(User.id == user_id).first()
+    if row is None or row.is_deleted:
+        return None
+    return row.token_version or 0
+
+class TokenUser:
+    """토큰 클레임으로 만든 사용자 정보 (권한 확인용, DB 조회 없음)"""
+
+    def __init__(self, id: int, email: str, is_approved: bool, is_admin: bool):
+        self.id = id
+        self.email = email
+        self.is_approved = is_approved
+        self.is_admin = is_admin
+
+def _credentials_exception(detail: str = "유효하지 않은 토큰입니다") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _claims_version_valid(claims: dict, user: User) -> bool:
+    # 버전이 없는 이전 형식 토큰은 만료될 때까지 허용
+    return "ver" not in claims or claims["ver"] == (user.token_version or 0)
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """현재 사용자 가져오기"""
-    token = credentials.credentials
-    email = verify_token(token)
+    claims = decode_token(credentials.credentials)
+    email = claims.get("sub") if claims else None
     
     if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="유효하지 않은 토큰입니다",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception()
     
-    user = db.query(User).filter(
-        User.email == email,
-        User.is_deleted == False
-    ).first()
+    user = _get_user_for_claims(db, claims)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="사용자를 찾을 수 없습니다",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception("사용자를 찾을 수 없습니다")
+    if not _claims_version_valid(claims, user):
+        raise _credentials_exception("만료된 토큰입니다. 다시 로그인해주세요")
     
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_token_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> TokenUser:
+    """토큰 클레임으로 현재 사용자 확인 (토큰 버전이 최신이면 DB 조회 없음)"""
+    claims = decode_token(credentials.credentials)
+    if claims is None or claims.get("sub") is None:
+        raise _credentials_exception()
+    
+    if "uid" not in claims:
+        # 이전 형식 토큰 - 사용자 행에서 권한 정보 확인
+        user = _get_user_by_email(db, claims["sub"])
+        if user is None:
+            raise _credentials_exception("사용자를 찾을 수 없습니다")
+        return TokenUser(user.id, user.email, bool(user.is_approved), bool(user.is_admin))
+    
+    user_id = claims["uid"]
+    if not token_versions.is_valid(user_id, claims.get("ver", 0), lambda uid: _load_token_version(db, uid)):
+        raise _credentials_exception("만료된 토큰입니다. 다시 로그인해주세요")
+    return TokenUser(user_id, claims["sub"], bool(claims.get("apr")), bool(claims.get("adm")))
+
+def get_current_active_user(current_user: TokenUser = Depends(get_token_user)) -> TokenUser:
     """현재 활성 사용자 가져오기"""
     if not current_user.is_approved:
         raise HTTPException(
@@ -96,18 +261,18 @@ def get_current_user_optional(
     if token is None:
         return None
     
-    email = verify_token(token)
+    claims = decode_token(token)
+    email = claims.get("sub") if claims else None
     
     if email is None:
         return None
     
-    user = db.query(User).filter(
-        User.email == email,
-        User.is_deleted == False
-    ).first()
+    user = _get_user_for_claims(db, claims)
+    if user is None or not _claims_version_valid(claims, user):
+        return None
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_admin_user(current_user: TokenUser = Depends(get_token_user)) -> TokenUser:
     """현재 관리자 사용자 가져오기"""
     if not current_user.is_admin:
         raise HTTPException(
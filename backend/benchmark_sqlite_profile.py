@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+SQLite 성능 프로필 동시성 벤치마크
+기본 설정과 운영 프로필(WAL 등)에서 읽기/쓰기 스레드를 동시에 돌려 처리량과 잠금 오류를 비교합니다.
+
+사용법: python benchmark_sqlite_profile.py [--seconds 5] [--writers 4] [--readers 8]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from sqlite_profile import apply_sqlite_profile
+
+
+def _setup(engine):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS bench_comments (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                post_id INTEGER NOT NULL,
+                content TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_bench_post ON bench_comments (post_id, created_at)"))
+        for post_id in range(50):
+            conn.execute(
+                text("INSERT INTO bench_comments (post_id, content) VALUES (:p, :c)"),
+                [{"p": post_id, "c": "댓글 내용 " * 10} for _ in range(20)]
+            )
+
+
+def _run(engine, seconds: float, writers: int, readers: int) -> dict:
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def writer(worker_id: int):
+        n = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO bench_comments (post_id, content) VALUES (:p, :c)"),
+                        {"p": (worker_id + n) % 50, "c": f"동시성 테스트 댓글 {n}"}
+                    )
+                with lock:
+                    counts["writes"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+            n += 1
+
+    def reader(worker_id: int):
+        n = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT id, content FROM bench_comments WHERE post_id = :p ORDER BY created_at LIMIT 50"),
+                        {"p": (worker_id + n) % 50}
+                    ).fetchall()
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+            n += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts["writes_per_sec"] = round(counts["writes"] / seconds, 1)
+    counts["reads_per_sec"] = round(counts["reads"] / seconds, 1)
+    return counts
+
+
+def benchmark(profile: bool, seconds: float, writers: int, readers: int) -> dict:
+    workdir = tempfile.mkdtemp(prefix="eumsaem_bench_")
+    url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    # database.py와 동일한 연결 설정 (풀 크기는 스레드 수에 맞춤)
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=writers + readers,
+        max_overflow=0
+    )
+    if profile:
+        apply_sqlite_profile(engine)
+    _setup(engine)
+    try:
+        return _run(engine, seconds, writers, readers)
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 성능 프로필 동시성 벤치마크")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"벤치마크 설정: {args.seconds}초, 쓰기 스레드 {args.writers}개, 읽기 스레드 {args.readers}개")
+    results = {}
+    for label, profile in (("기본 설정", False), ("운영 프로필", True)):
+        results[label] = benchmark(profile, args.seconds, args.writers, args.readers)
+        r = results[label]
+        print(
+            f"{label}: 쓰기 {r['writes_per_sec']}/s, 읽기 {r['reads_per_sec']}/s, "
+            f"잠금 오류 {r['locked']}회"
+        )
+
+    base, tuned = results["기본 설정"], results["운영 프로필"]
+    if base["writes_per_sec"] and base["reads_per_sec"]:
+        print(
+            f"개선율: 쓰기 x{tuned['writes_per_sec'] / base['writes_per_sec']:.2f}, "
+            f"읽기 x{tuned['reads_per_sec'] / base['reads_per_sec']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
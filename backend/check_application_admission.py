@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+선착순 지원 정원 동시성 검증 스크립트
+정원(--capacity)이 있는 신청 양식에 동시 지원 요청(--requests)을 한꺼번에 보내고,
+성공한 지원자 수와 저장된 current_applicants / 사용자 / 지원서 수가 정확히 정원과 같은지 확인합니다.
+
+기본은 임시 SQLite DB를 사용합니다. PostgreSQL로 확인하려면 빈 테스트 DB 주소를 --database-url로 지정하세요.
+(지정한 DB에 테이블을 만들고 데이터를 추가하므로 운영 DB에는 사용하지 마세요)
+
+사용법: python check_application_admission.py [--requests 300] [--capacity 50] [--database-url URL]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="선착순 지원 정원 동시성 검증")
+    parser.add_argument("--requests", type=int, default=300, help="동시에 보낼 지원 요청 수")
+    parser.add_argument("--capacity", type=int, default=50, help="신청 양식 정원 (max_applicants)")
+    parser.add_argument("--database-url", default=None, help="검증용 DB 주소 (기본: 임시 SQLite)")
+    return parser.parse_args()
+
+
+async def _fire(app, total: int):
+    import httpx
+
+    async def apply(client, i):
+        return await client.post("/api/auth/integrated-application", json={
+            "email": f"admission{i}@example.com",
+            "username": f"admission{i}",
+            "password": "password",
+            "real_name": f"지원자{i}",
+            "student_id": f"2024{i:05d}",
+            "motivation": "선착순 동시성 검증",
+        })
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://admission-check", timeout=120) as client:
+        return await asyncio.gather(*[apply(client, i) for i in range(total)])
+
+
+def main():
+    args = _parse_args()
+    workdir = tempfile.mkdtemp(prefix="admission_check_")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(workdir, 'admission.db')}"
+    # 동시 요청 폭주 자체를 보는 검증이므로 요청 제한/해싱 대기열 제한은 끔
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.requests + 1)
+    os.environ.setdefault("ACCESS_LOG_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    import auth
+    from main import app
+    from database import SessionLocal
+    from models import User, Application, ApplicationForm
+
+    # 해싱 비용은 검증 대상이 아니므로 최소 라운드 사용
+    auth.pwd_context.update(bcrypt__rounds=4)
+
+    db = SessionLocal()
+    try:
+        db.query(ApplicationForm).update({ApplicationForm.is_active: False})
+        form = ApplicationForm(is_active=True, max_applicants=args.capacity, current_applicants=0)
+        db.add(form)
+        db.commit()
+        form_id = form.id
+        users_before = db.query(User).count()
+        applications_before = db.query(Application).count()
+    finally:
+        db.close()
+
+    start = time.perf_counter()
+    responses = asyncio.run(_fire(app, args.requests))
+    elapsed = time.perf_counter() - start
+
+    outcomes = Counter(
+        "admitted" if r.status_code == 200
+        else "closed" if r.status_code == 400 and "마감" in r.json().get("detail", "")
+        else f"{r.status_code} {r.text[:80]}"
+        for r in responses
+    )
+
+    db = SessionLocal()
+    try:
+        current_applicants = db.get(ApplicationForm, form_id).current_applicants
+        new_users = db.query(User).count() - users_before
+        new_applications = db.query(Application).count() - applications_before
+    finally:
+        db.close()
+
+    expected = min(args.capacity, args.requests)
+    print(f"요청 {args.requests}건 / 정원 {args.capacity} / {elapsed:.2f}초")
+    print(f"결과: {dict(outcomes)}")
+    print(f"current_applicants={current_applicants}, 새 사용자={new_users}, 새 지원서={new_applications}")
+
+    checks = {
+        "성공 응답 수": outcomes["admitted"] == expected,
+        "마감 응답 수": outcomes["closed"] == args.requests - expected,
+        "current_applicants": current_applicants == expected,
+        "사용자 수": new_users == expected,
+        "지원서 수": new_applications == expected,
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print("통과: 정원이 정확히 지켜졌습니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+엔드포인트별 쿼리 수 회귀 검증 스크립트
+게시글/댓글/앨범/아이템/지원서를 --rows 개씩 넣고 주요 조회 API를 호출해,
+요청 하나에 실행된 쿼리 수(sql_metrics 라우트 통계, 인증 조회 포함)가 정해진 값을 넘지 않는지 확인합니다.
+행 수와 관계없이 같아야 하므로 N+1(행마다 지연 로딩)이 다시 생기면 실패합니다.
+
+임시 SQLite DB를 사용합니다.
+
+사용법: python check_query_counts.py [--rows 30]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+# 엔드포인트별 최대 쿼리 수 (인증 캐시가 채워진 뒤 기준)
+MAX_QUERIES = {
+    "게시글 목록": ("/api/posts", "GET /api/posts", 1),
+    "게시글 상세": ("/api/posts/{post_id}", "GET /api/posts/{post_id}", 2),
+    "댓글 목록": ("/api/posts/{post_id}/comments", "GET /api/posts/{post_id}/comments", 3),
+    "앨범 목록": ("/api/gallery", "GET /api/gallery", 2),
+    "앨범 상세": ("/api/gallery/{album_id}", "GET /api/gallery/{album_id}", 3),
+    "지원서 목록": ("/api/applications", "GET /api/applications", 1),
+}
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="엔드포인트별 쿼리 수 회귀 검증")
+    parser.add_argument("--rows", type=int, default=30, help="종류별로 넣을 행 수 (목록 limit 이하 권장)")
+    return parser.parse_args()
+
+
+def _seed(rows: int):
+    """관리자 1명과 작성자 rows명, 게시글/댓글/앨범/아이템/지원서 rows개씩 생성"""
+    from auth import create_user_access_token
+    from database import SessionLocal
+    from models import User, Post, Comment, GalleryAlbum, GalleryItem, Application
+
+    db = SessionLocal()
+    try:
+        admin = User(email="admin@example.com", username="admin", password_hash="x",
+                     real_name="관리자", is_approved=True, is_admin=True)
+        db.add(admin)
+        # 작성자를 행마다 다르게 두어야 작성자 지연 로딩(N+1)이 쿼리 수에 드러남
+        authors = [
+            User(email=f"member{i}@example.com", username=f"member{i}", password_hash="x",
+                 real_name=f"부원{i}", is_approved=True)
+            for i in range(rows)
+        ]
+        db.add_all(authors)
+        db.flush()
+
+        post = None
+        for i, author in enumerate(authors):
+            post = Post(title=f"게시글 {i}", content="내용", category="정보글", author_id=author.id)
+            db.add(post)
+            db.add(Application(applicant_id=author.id, motivation="지원 동기", status="pending"))
+        db.flush()
+        for author in authors:
+            db.add(Comment(post_id=post.id, author_id=author.id, content="댓글"))
+        post.comment_count = rows
+
+        album = None
+        for i, author in enumerate(authors):
+            album = GalleryAlbum(title=f"앨범 {i}", category="공연", uploader_id=author.id)
+            db.add(album)
+            db.flush()
+            db.add(GalleryItem(album_id=album.id, title=f"사진 {i}", file_path=f"/gallery/{i}.jpg",
+                               file_type="image", uploader_id=author.id))
+        # 마지막 앨범에는 여러 사람이 올린 아이템을 rows개
+        for i, author in enumerate(authors):
+            db.add(GalleryItem(album_id=album.id, title=f"추가 사진 {i}", file_path=f"/gallery/extra{i}.jpg",
+                               file_type="image", uploader_id=author.id))
+        db.commit()
+        return create_user_access_token(admin), post.id, album.id
+    finally:
+        db.close()
+
+
+def main():
+    args = _parse_args()
+    workdir = tempfile.mkdtemp(prefix="query_count_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'query_count.db')}"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("ACCESS_LOG_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+
+    import sql_metrics
+    from main import app
+
+    token, post_id, album_id = _seed(args.rows)
+    # 비동기 라우트에서 지연 로딩이 생기면 예외(500)가 나므로 응답 코드로 실패 처리
+    client = TestClient(app, raise_server_exceptions=False)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    failed = []
+    for name, (path, route_key, limit) in MAX_QUERIES.items():
+        url = path.format(post_id=post_id, album_id=album_id)
+        # 첫 요청은 사용자/토큰 캐시를 채우므로 두 번째 요청의 쿼리 수만 확인
+        client.get(url, headers=headers)
+        sql_metrics.route_stats.reset()
+        response = client.get(url, headers=headers)
+        queries = sql_metrics.route_stats.snapshot().get(route_key, {}).get("max_queries")
+        ok = response.status_code == 200 and queries is not None and queries <= limit
+        print(f"{'통과' if ok else '실패'} {name} ({url}): 쿼리 {queries}회 / 최대 {limit}회, 응답 {response.status_code}")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"통과: 행 {args.rows}개에서도 모든 엔드포인트가 정해진 쿼리 수 이내입니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+요청 제한 클라이언트 IP 검증 스크립트
+프록시 1개(RATE_LIMIT_TRUSTED_PROXY_HOPS=1) 뒤에서 로그인 요청을 보내 다음을 확인합니다.
+- 같은 프록시를 거친 서로 다른 방문자가 프록시 주소 하나의 버킷을 나눠 쓰지 않는지
+- X-Forwarded-For 앞쪽에 임의 주소를 넣어도(위조) 같은 버킷으로 제한되는지
+- 프록시 없이 직접 노출(RATE_LIMIT_TRUSTED_PROXY_HOPS=0)이면 X-Forwarded-For를 무시하는지
+- 기본 제한값에서 NAT 주소 하나를 공유하는 지원자 --applicants명이 한꺼번에 가입해도 막히지 않고,
+  같은 이메일 반복 요청은 이메일 제한으로 막히는지
+
+임시 SQLite DB를 사용합니다.
+
+사용법: python check_rate_limit_ip.py [--limit 3] [--applicants 40]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="요청 제한 클라이언트 IP 검증")
+    parser.add_argument("--limit", type=int, default=3, help="IP별 로그인 허용 횟수")
+    parser.add_argument("--applicants", type=int, default=40, help="NAT 주소 하나를 공유하는 동시 가입자 수")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    workdir = tempfile.mkdtemp(prefix="rate_limit_ip_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'rate_limit.db')}"
+    os.environ["RATE_LIMIT_ENABLED"] = "true"
+    os.environ["RATE_LIMIT_BACKEND"] = "memory"
+    os.environ["RATE_LIMIT_TRUSTED_PROXY_HOPS"] = "1"
+    os.environ["LOGIN_RATE_LIMIT_IP"] = f"{args.limit}/600"
+    os.environ["LOGIN_RATE_LIMIT_EMAIL"] = "1000/600"
+    os.environ.setdefault("ACCESS_LOG_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+    from starlette.requests import Request
+
+    import auth
+    import rate_limit
+    from main import app
+
+    # 해싱 비용은 검증 대상이 아니므로 최소 라운드 사용
+    auth.pwd_context.update(bcrypt__rounds=4)
+
+    # TestClient의 연결 주소("testclient")가 프록시 역할
+    client = TestClient(app)
+
+    def login(forwarded_for: str, i: int) -> int:
+        return client.post(
+            "/api/auth/login",
+            json={"email": f"visitor{i}@example.com", "password": "password"},
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    # 서로 다른 방문자 (프록시가 각자의 주소를 덧붙임)
+    visitors = args.limit * 3
+    shared_proxy = [login(f"198.51.100.{i}", i) for i in range(visitors)]
+
+    # 한 공격자가 매 요청마다 앞쪽에 다른 주소를 위조 (프록시가 실제 주소 203.0.113.7을 덧붙임)
+    attempts = args.limit * 2
+    spoofed = [login(f"10.0.{i}.1, 203.0.113.7", visitors + i) for i in range(attempts)]
+
+    # 같은 캠퍼스 NAT 주소에서 모집 시작 직후 몰린 가입 (가입 제한은 기본값 그대로)
+    def register(email: str, i: int) -> int:
+        return client.post(
+            "/api/auth/register",
+            json={"email": email, "username": f"campus{i}", "password": "password", "real_name": f"지원자{i}"},
+            headers={"X-Forwarded-For": "192.0.2.200"},
+        ).status_code
+
+    campus = [register(f"campus{i}@example.com", i) for i in range(args.applicants)]
+    # 한 이메일로 반복 가입 시도 (첫 요청 성공, 이후 중복 400, 이메일 제한 초과 후 429)
+    repeated = [register("repeat@example.com", args.applicants + i) for i in range(5)]
+
+    def resolve(hops: int, forwarded_for: str) -> str:
+        rate_limit.RATE_LIMIT_TRUSTED_PROXY_HOPS = hops
+        scope = {
+            "type": "http", "method": "GET", "path": "/", "query_string": b"",
+            "headers": [(b"x-forwarded-for", forwarded_for.encode())],
+            "client": ("192.0.2.10", 50000),
+        }
+        return rate_limit.client_ip(Request(scope))
+
+    direct = resolve(0, "10.9.9.9")
+    two_proxies = resolve(2, "10.9.9.9, 203.0.113.7, 10.0.0.2")
+
+    print(f"같은 프록시 뒤 방문자 {visitors}명: {shared_proxy}")
+    print(f"위조한 X-Forwarded-For {attempts}회: {spoofed}")
+    print(f"직접 노출 시 IP: {direct}, 프록시 2개 뒤 IP: {two_proxies}")
+    print(f"NAT 주소 하나에서 가입 {args.applicants}건: 성공 {campus.count(200)}건, 제한 {campus.count(429)}건")
+    print(f"같은 이메일 반복 가입 5회: {repeated}")
+
+    checks = {
+        "프록시 공유 방문자 제한 안 됨": all(code == 401 for code in shared_proxy),
+        "위조 헤더도 실제 주소로 제한": spoofed == [401] * args.limit + [429] * (attempts - args.limit),
+        "직접 노출 시 헤더 무시": direct == "192.0.2.10",
+        "프록시 2개 뒤 주소": two_proxies == "203.0.113.7",
+        "NAT 공유 지원자 제한 안 됨": campus == [200] * args.applicants,
+        "같은 이메일 반복 제한": repeated[0] == 200 and repeated[-1] == 429,
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print("통과: 프록시 뒤에서도 방문자별로, 위조할 수 없는 주소로 제한되고 NAT를 공유하는 지원자는 막지 않습니다")
+
+
+if __name__ == "__main__":
+    main()
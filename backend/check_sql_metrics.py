@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+SQL 계측 검증 스크립트
+한 연결에서 실패하는 쿼리를 실행한 뒤 이어서 실행한 쿼리의 시간이 올바르게 집계되는지,
+연결에 쿼리 시작 시각이 남지 않는지(풀에 반환된 연결 재사용 시 누적되지 않는지) 확인합니다.
+
+사용법: python check_sql_metrics.py [--sleep-ms 50] [--failures 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description="실패한 쿼리 이후 SQL 계측 검증")
+    parser.add_argument("--sleep-ms", type=float, default=50, help="시간을 확인할 쿼리의 실행 시간 (밀리초)")
+    parser.add_argument("--failures", type=int, default=100, help="실패시킬 쿼리 수")
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.pool import StaticPool
+
+    import sql_metrics
+
+    # 연결 하나를 계속 재사용하는 풀 (운영의 풀 연결 재사용과 같은 상황)
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def _register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+    sql_metrics.instrument_engine(engine)
+
+    stats = sql_metrics.begin_request()
+    failures = 0
+    for _ in range(args.failures):
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except OperationalError:
+                failures += 1
+
+    with engine.connect() as conn:
+        leftover = len(conn.info.get("query_start_time", []))
+        start = time.perf_counter()
+        conn.execute(text("SELECT sleep_ms(:ms)"), {"ms": args.sleep_ms})
+        measured_ms = (time.perf_counter() - start) * 1000
+        leftover_after = len(conn.info.get("query_start_time", []))
+    sql_metrics.end_request(stats, "CHECK", "/sql-metrics", measured_ms)
+
+    print(f"실패한 쿼리 {failures}건, 남은 시작 시각 {leftover}개 -> {leftover_after}개")
+    print(f"집계된 쿼리 {stats.query_count}회, 가장 느린 쿼리 {stats.slowest_ms:.1f}ms (실측 {measured_ms:.1f}ms)")
+
+    checks = {
+        "쿼리 실패": failures == args.failures,
+        "시작 시각 정리": leftover == 0 and leftover_after == 0,
+        "실패한 쿼리도 집계": stats.query_count == args.failures + 1,
+        "다음 쿼리 시간": args.sleep_ms <= stats.slowest_ms <= measured_ms,
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print("통과: 실패한 쿼리 이후에도 쿼리 시간이 올바르게 집계됩니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+토큰 버전 캐시 검증 스크립트 (여러 인스턴스)
+이 프로세스의 사용자 캐시/토큰 버전 맵을 채운 뒤, 다른 인스턴스에서 한 것처럼 DB에서만 관리자 권한과
+token_version을 올리고(이 프로세스의 캐시 무효화 없음) 다음을 확인합니다.
+- 새 버전으로 발급된 토큰은 캐시가 오래되었어도 바로 통과하는지 (토큰 클레임 / 사용자 행 기반 인증 모두)
+- 이전 버전 토큰은 거부되는지
+
+임시 SQLite DB를 사용합니다.
+
+사용법: python check_token_versions.py
+"""
+import os
+import sys
+import tempfile
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="token_version_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'token_version.db')}"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    # 캐시가 확실히 오래된 상태를 유지하도록 갱신 주기를 길게
+    os.environ["USER_CACHE_TTL"] = "3600"
+    os.environ["TOKEN_VERSION_REFRESH_SECONDS"] = "3600"
+    os.environ.setdefault("ACCESS_LOG_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+
+    from auth import create_user_access_token
+    from main import app
+    from database import SessionLocal
+    from models import User
+
+    db = SessionLocal()
+    try:
+        user = User(email="member@example.com", username="member", password_hash="x",
+                    real_name="부원", is_approved=True, is_admin=False, token_version=0)
+        db.add(user)
+        db.commit()
+        old_token = create_user_access_token(user)
+    finally:
+        db.close()
+
+    client = TestClient(app)
+
+    def call(path: str, token: str) -> int:
+        return client.get(path, headers={"Authorization": f"Bearer {token}"}).status_code
+
+    # 이 프로세스의 캐시 채우기 (사용자 행 캐시 + 토큰 버전 맵)
+    warm = {path: call(path, old_token) for path in ("/api/auth/me", "/api/posts/summary", "/api/search?q=검색어")}
+
+    # 다른 인스턴스에서 관리자로 변경 (DB만 갱신, 이 프로세스 캐시는 그대로)
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "member@example.com").one()
+        user.is_admin = True
+        user.token_version = 1
+        db.commit()
+        new_token = create_user_access_token(user)
+    finally:
+        db.close()
+
+    results = {
+        "새 토큰 - 사용자 행 기반 (/api/auth/me)": (call("/api/auth/me", new_token), 200),
+        "새 토큰 - 토큰 클레임 기반 (/api/search)": (call("/api/search?q=검색어", new_token), 200),
+        "새 토큰 - 관리자 권한 (/api/applications)": (call("/api/applications", new_token), 200),
+        "이전 토큰 - 사용자 행 기반 (/api/auth/me)": (call("/api/auth/me", old_token), 401),
+        "이전 토큰 - 토큰 클레임 기반 (/api/search)": (call("/api/search?q=검색어", old_token), 401),
+    }
+
+    print(f"캐시 채우기: {warm}")
+    failed = []
+    for name, (actual, expected) in results.items():
+        ok = actual == expected
+        print(f"{'통과' if ok else '실패'} {name}: {actual} (기대 {expected})")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print("통과: 다른 인스턴스에서 올린 토큰 버전도 바로 반영되고, 이전 토큰은 거부됩니다")
+
+
+if __name__ == "__main__":
+    main()
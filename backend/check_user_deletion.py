@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+회원 삭제 검증 스크립트
+SQLite 운영 프로필(SQLITE_PERFORMANCE_PROFILE=true)에 외래 키 검사(SQLITE_FOREIGN_KEYS=ON)까지 켠 상태에서
+게시글/댓글이 있는 사용자를 회원 탈퇴(DELETE /api/users/me)와 관리자 거부(POST /api/users/{id}/reject)로 삭제하고,
+삭제가 성공하는지와 남은 게시글의 comment_count가 실제 댓글 수와 같은지 확인합니다.
+
+임시 SQLite DB를 사용합니다.
+
+사용법: python check_user_deletion.py
+"""
+import os
+import sys
+import tempfile
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix="user_deletion_check_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'deletion.db')}"
+    os.environ["SQLITE_PERFORMANCE_PROFILE"] = "true"
+    os.environ["SQLITE_FOREIGN_KEYS"] = "ON"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("ACCESS_LOG_ENABLED", "false")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func, text
+
+    import auth
+    from main import app
+    from database import SessionLocal
+    from models import User, Post, Comment
+
+    auth.pwd_context.update(bcrypt__rounds=4)
+    client = TestClient(app)
+
+    def signup(name: str, is_admin: bool = False) -> dict:
+        client.post("/api/auth/register", json={
+            "email": f"{name}@example.com", "username": name, "password": "password", "real_name": name,
+        })
+        db = SessionLocal()
+        try:
+            user = db.query(User).filter(User.username == name).one()
+            user.is_approved = True
+            user.is_admin = is_admin
+            db.commit()
+        finally:
+            db.close()
+        token = client.post("/api/auth/login", json={"email": f"{name}@example.com", "password": "password"})
+        return {"Authorization": f"Bearer {token.json()['access_token']}"}
+
+    def write_post(headers: dict) -> int:
+        return client.post("/api/posts", json={"title": "제목", "content": "내용", "category": "정보글"},
+                           headers=headers).json()["id"]
+
+    def write_comment(post_id: int, headers: dict):
+        client.post(f"/api/posts/{post_id}/comments", json={"content": "댓글"}, headers=headers)
+
+    admin = signup("admin", is_admin=True)
+    leaving = signup("leaving")
+    rejected = signup("rejected")
+
+    admin_post = write_post(admin)
+    leaving_post = write_post(leaving)
+    rejected_post = write_post(rejected)
+    # 삭제할 사용자의 게시글에 다른 사람 댓글 + 다른 사람 게시글에 삭제할 사용자의 댓글
+    for post_id in (leaving_post, rejected_post):
+        write_comment(post_id, admin)
+    for headers in (admin, leaving, rejected):
+        write_comment(admin_post, headers)
+    write_comment(leaving_post, leaving)
+
+    db = SessionLocal()
+    try:
+        foreign_keys = db.execute(text("PRAGMA foreign_keys")).scalar()
+        rejected_id = db.query(User.id).filter(User.username == "rejected").scalar()
+    finally:
+        db.close()
+
+    leave = client.request("DELETE", "/api/users/me", json={"password": "password"}, headers=leaving)
+    reject = client.post(f"/api/users/{rejected_id}/reject", headers=admin)
+
+    db = SessionLocal()
+    try:
+        remaining_users = {name for (name,) in db.query(User.username)}
+        stored_count = db.get(Post, admin_post).comment_count
+        actual_count = db.query(func.count(Comment.id)).filter(Comment.post_id == admin_post).scalar()
+        orphans = db.query(func.count(Comment.id)).filter(Comment.post_id.notin_(db.query(Post.id))).scalar()
+    finally:
+        db.close()
+
+    print(f"PRAGMA foreign_keys={foreign_keys}")
+    print(f"회원 탈퇴: {leave.status_code} {leave.text[:80]}")
+    print(f"관리자 거부: {reject.status_code} {reject.text[:80]}")
+    print(f"남은 사용자: {sorted(remaining_users)}")
+    print(f"관리자 게시글 comment_count={stored_count}, 실제 댓글 수={actual_count}, 고아 댓글={orphans}")
+
+    checks = {
+        "외래 키 검사 켜짐": foreign_keys == 1,
+        "회원 탈퇴 성공": leave.status_code == 200,
+        "관리자 거부 성공": reject.status_code == 200,
+        "사용자 삭제": remaining_users == {"admin"},
+        "comment_count": stored_count == actual_count == 1,
+        "고아 댓글 없음": orphans == 0,
+    }
+    failed = [name for name, ok in checks.items() if not ok]
+    if failed:
+        print(f"실패: {', '.join(failed)}")
+        sys.exit(1)
+    print("통과: 게시글/댓글이 있는 사용자도 외래 키 위반 없이 삭제됩니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+조건부 GET (ETag)
+응답 본문 대신 가벼운 지문(수정 시각, 최대 id, 개수 등)으로 약한 ETag를 만들고,
+클라이언트가 가진 버전과 같으면 본문을 조회/직렬화하지 않고 304를 반환합니다.
+Last-Modified는 보내지 않습니다 - 댓글 삭제, 지원자 수 증가처럼 수정 시각을 바꾸지 않는 변경이 있어
+If-Modified-Since만 보내는 클라이언트가 오래된 본문을 계속 쓰게 되기 때문입니다.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# 캐시 정책이 따로 없는 응답의 기본값 - 브라우저가 저장은 하되 매번 ETag로 재검증
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """지문 값들로 약한 ETag 생성 (W/"...")"""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # 약한 비교: W/ 접두사를 무시하고 값만 비교
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def conditional_response(request: Request, response: Response, *fingerprint) -> Optional[Response]:
+    """ETag 헤더를 설정하고, 클라이언트 캐시가 최신이면 304 응답을 반환
+
+    라우트에서 본문을 조회하기 전에 호출:
+        not_modified = conditional_response(request, response, post.updated_at, post.comment_count)
+        if not_modified:
+            return not_modified
+    """
+    etag = weak_etag(*fingerprint)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": response.headers.get("Cache-Control", REVALIDATE_CACHE_CONTROL),
+    }
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return None
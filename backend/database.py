@@ -1,23 +1,91 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from starlette.concurrency import run_in_threadpool
+from fastapi import Request
 import os
 
+from db_pool import pool_options, describe_pool
+from db_replica import ReplicaMonitor, RecentWriteTracker, client_key
+from sqlite_profile import SQLITE_PROFILE_ENABLED, apply_sqlite_profile
+from sql_metrics import instrument_engine
+
 # 데이터베이스 설정 (환경변수 우선, 없으면 SQLite 사용)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eumsaem.db")
+# 읽기 전용 복제본 (선택, 설정하지 않으면 모든 읽기가 기본 DB로 감)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+def to_async_url(url: str) -> str:
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환 (asyncpg / aiosqlite)"""
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
 
 # PostgreSQL과 SQLite에 따른 connect_args 설정
-if DATABASE_URL.startswith("postgresql"):
-    engine = create_engine(DATABASE_URL)
-else:
+def _create_engine(url: str):
+    if url.startswith("postgresql"):
+        # 커넥션 풀 크기/재사용 정책은 DB_POOL_* 환경변수로 조정
+        return instrument_engine(create_engine(url, **pool_options()))
     # SQLite용 설정
-    engine = create_engine(
-        DATABASE_URL, 
+    sqlite_engine = create_engine(
+        url,
         connect_args={"check_same_thread": False}
     )
+    # 운영용 SQLite 프로필 (WAL, mmap, busy_timeout 등) - SQLITE_PERFORMANCE_PROFILE=true
+    if SQLITE_PROFILE_ENABLED:
+        apply_sqlite_profile(sqlite_engine)
+    return instrument_engine(sqlite_engine)
+
+# 비동기 엔진 (async 라우트 핸들러에서 이벤트 루프를 막지 않도록 사용)
+def _create_async_engine(url: str):
+    if url.startswith("postgresql"):
+        return instrument_engine(create_async_engine(to_async_url(url), **pool_options(async_engine=True)))
+    sqlite_engine = create_async_engine(to_async_url(url))
+    if SQLITE_PROFILE_ENABLED:
+        apply_sqlite_profile(sqlite_engine)
+    return instrument_engine(sqlite_engine)
+
+def _async_sessionmaker(bind):
+    # expire_on_commit=False: 커밋 후 응답 직렬화 시 지연 로딩(I/O)이 발생하지 않도록 함
+    return async_sessionmaker(
+        bind=bind,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
 
+engine = _create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+async_engine = _create_async_engine(DATABASE_URL)
+AsyncSessionLocal = _async_sessionmaker(async_engine)
+
+# 읽기 복제본 엔진 및 상태 감시
+if DATABASE_READ_URL:
+    read_engine = _create_engine(DATABASE_READ_URL)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+    async_read_engine = _create_async_engine(DATABASE_READ_URL)
+    AsyncReadSessionLocal = _async_sessionmaker(async_read_engine)
+    replica_monitor = ReplicaMonitor(read_engine)
+else:
+    read_engine = None
+    ReadSessionLocal = None
+    async_read_engine = None
+    AsyncReadSessionLocal = None
+    replica_monitor = None
+
+# 쓰기 직후 같은 클라이언트의 읽기는 기본 DB로 보냄
+recent_writes = RecentWriteTracker()
+
 Base = declarative_base()
 
 # 데이터베이스 세션 의존성
@@ -27,3 +95,62 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def mark_recent_write(request: Request):
+    """쓰기 요청 완료 후 호출 - 잠시 동안 해당 클라이언트의 읽기를 기본 DB로 고정"""
+    if replica_monitor is not None:
+        recent_writes.mark(client_key(request))
+
+def _replica_usable(request: Request) -> bool:
+    if replica_monitor is None or recent_writes.is_recent(client_key(request)):
+        return False
+    if not replica_monitor.healthy:
+        replica_monitor.record_fallback()
+        return False
+    return True
+
+# 읽기 전용 세션 의존성 (복제본이 없거나 비정상이면 기본 DB 사용)
+def get_read_db(request: Request):
+    if replica_monitor is not None and replica_monitor.needs_check():
+        replica_monitor.check()
+    use_replica = _replica_usable(request)
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    except DBAPIError as e:
+        if use_replica:
+            replica_monitor.mark_failed(e)
+        raise
+    finally:
+        db.close()
+
+# 비동기 읽기 전용 세션 의존성
+async def get_async_read_db(request: Request):
+    if replica_monitor is not None and replica_monitor.needs_check():
+        await run_in_threadpool(replica_monitor.check)
+    use_replica = _replica_usable(request)
+    session_factory = AsyncReadSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as db:
+        try:
+            yield db
+        except DBAPIError as e:
+            if use_replica:
+                replica_monitor.mark_failed(e)
+            raise
+
+# 커넥션 풀 상태 조회 (관리자 모니터링용)
+def get_pool_stats() -> dict:
+    stats = {
+        "primary": describe_pool(engine.pool),
+        "primary_async": describe_pool(async_engine.sync_engine.pool)
+    }
+    if replica_monitor is not None:
+        stats["replica"] = describe_pool(read_engine.pool)
+        stats["replica_async"] = describe_pool(async_read_engine.sync_engine.pool)
+        stats["replica_status"] = replica_monitor.status()
+    return stats
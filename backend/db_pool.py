@@ -0,0 +1,136 @@
+"""
+데이터베이스 커넥션 풀 설정 및 런타임 통계
+환경변수로 풀 크기/오버플로/pre-ping/recycle/timeout을 조정하고,
+체크아웃 대기 시간 히스토그램을 수집합니다.
+"""
+import os
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# 커넥션 풀 설정 (환경변수 우선)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 초 단위, -1이면 재생성 안 함
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 체크아웃 대기 최대 시간(초)
+
+# 체크아웃 지연 히스토그램 버킷 (밀리초, 상한값 기준)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def pool_options(async_engine: bool = False) -> dict:
+    """create_engine / create_async_engine에 넘길 풀 관련 인자"""
+    return {
+        "poolclass": TimedAsyncQueuePool if async_engine else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+
+class PoolStats:
+    """풀 체크아웃 횟수/대기/타임아웃/지연 히스토그램 누적"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, waited: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.total_wait_ms += elapsed_ms
+            self.max_wait_ms = max(self.max_wait_ms, elapsed_ms)
+            for index, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    self.histogram[index] += 1
+                    break
+            else:
+                self.histogram[-1] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "avg_checkout_ms": round(self.total_wait_ms / attempts, 3) if attempts else 0.0,
+                "max_checkout_ms": round(self.max_wait_ms, 3),
+                "checkout_latency_histogram": dict(zip(labels, self.histogram)),
+            }
+
+
+class _TimedPoolMixin:
+    """체크아웃 소요 시간을 측정하는 QueuePool 확장"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        # 유휴 연결이 없고 오버플로도 소진된 상태면 대기가 발생함
+        waited = self.checkedin() == 0 and self._overflow >= self._max_overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record((time.perf_counter() - start) * 1000, waited, timed_out=True)
+            raise
+        self.stats.record((time.perf_counter() - start) * 1000, waited)
+        return connection
+
+    def recreate(self):
+        # dispose() 이후에도 누적 통계 유지
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        return new_pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def describe_pool(pool) -> dict:
+    """풀의 현재 상태와 누적 통계"""
+    info = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        info.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        info.update(stats.snapshot())
+    return info
@@ -0,0 +1,138 @@
+"""
+읽기 전용 복제본 상태 감시 및 read-after-write 고정
+복제본이 끊기거나 지연이 크면 읽기 요청을 기본 DB로 돌리고,
+방금 쓰기를 한 클라이언트는 잠시 동안 기본 DB에서 읽도록 합니다.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+# 허용 가능한 복제 지연 (초) - 초과하면 기본 DB 사용
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# 복제본 상태 확인 주기 (초)
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "10"))
+# 쓰기 직후 기본 DB에서 읽도록 고정하는 시간 (초)
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# 복제본이 최신 WAL까지 재생했으면 0, 아니면 마지막 재생 트랜잭션 이후 경과 시간
+_PG_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """복제본 연결 가능 여부와 지연 시간을 주기적으로 확인"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._checking = False
+        self.healthy = True
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at = 0.0
+        self.fallbacks = 0
+
+    def needs_check(self) -> bool:
+        return time.monotonic() - self.checked_at >= REPLICA_HEALTH_CHECK_INTERVAL
+
+    def check(self) -> bool:
+        """복제본 상태 확인 (동기 엔진 사용, async 라우트에서는 스레드풀에서 호출)
+
+        연결/쿼리는 잠금 밖에서 한 요청만 수행하고, 그동안 다른 요청은 마지막 결과를 그대로 사용합니다.
+        """
+        with self._lock:
+            if self._checking or not self.needs_check():
+                return self.healthy
+            self._checking = True
+
+        lag: Optional[float] = None
+        error: Optional[str] = None
+        try:
+            with self.engine.connect() as conn:
+                if self.engine.dialect.name == "postgresql":
+                    lag = float(conn.execute(_PG_LAG_QUERY).scalar() or 0)
+                else:
+                    conn.execute(text("SELECT 1"))
+                    lag = 0.0
+        except Exception as e:
+            error = str(e)
+            print(f"읽기 복제본 상태 확인 실패, 기본 DB 사용: {e}")
+
+        # 결과 반영만 잠금 안에서
+        with self._lock:
+            self.lag_seconds = lag
+            if error is None:
+                self.healthy = lag <= REPLICA_MAX_LAG_SECONDS
+                self.last_error = None if self.healthy else f"복제 지연 {lag:.1f}초"
+            else:
+                self.healthy = False
+                self.last_error = error
+            self.checked_at = time.monotonic()
+            self._checking = False
+            return self.healthy
+
+    def mark_failed(self, error: Exception):
+        """쿼리 중 복제본 오류 발생 시 다음 확인 주기까지 사용 중단"""
+        with self._lock:
+            self.healthy = False
+            self.last_error = str(error)
+            self.checked_at = time.monotonic()
+
+    def record_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def status(self) -> dict:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_error": self.last_error,
+            "fallbacks": self.fallbacks,
+            "max_lag_seconds": REPLICA_MAX_LAG_SECONDS,
+        }
+
+
+class RecentWriteTracker:
+    """쓰기를 한 클라이언트를 잠시 기억해 read-after-write 일관성 보장"""
+
+    def __init__(self, max_entries: int = 10000):
+        self._lock = threading.Lock()
+        self._writes = {}
+        self._max_entries = max_entries
+
+    def mark(self, client_key: str):
+        if not client_key:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._writes) >= self._max_entries:
+                # 만료된 항목 정리 후에도 가득 차면 가장 오래된 항목 제거
+                expired = [k for k, t in self._writes.items() if now - t > REPLICA_STICKY_SECONDS]
+                for key in expired:
+                    del self._writes[key]
+                if len(self._writes) >= self._max_entries:
+                    del self._writes[next(iter(self._writes))]
+            self._writes.pop(client_key, None)
+            self._writes[client_key] = now
+
+    def is_recent(self, client_key: str) -> bool:
+        if not client_key:
+            return False
+        with self._lock:
+            written_at = self._writes.get(client_key)
+        return written_at is not None and time.monotonic() - written_at <= REPLICA_STICKY_SECONDS
+
+
+def client_key(request) -> str:
+    """요청한 클라이언트 식별 키 (토큰이 있으면 토큰, 없으면 IP)"""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else ""
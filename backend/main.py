@@ -1,23 +1,30 @@
-from fastapi import FastAPI, HTTPException, Depends, status, Request
+from fastapi import FastAPI, HTTPException, Depends, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
 import uvicorn
 import os
+import time
 
-from database import SessionLocal, engine, Base
+from database import SessionLocal, engine, Base, get_read_db, mark_recent_write
 from models import *
 from schemas import *
 from auth import *
-from routes import auth, users, posts, gallery, applications, application_form, email_test, admin, comments
+from routes import auth, users, posts, gallery, applications, application_form, email_test, admin, comments, search
 from logging_config import setup_logging
+import sql_metrics
+import access_log
+from search_index import search_index
+from conditional_get import conditional_response
 
 # 로깅 설정 초기화
 logger = setup_logging()
 
 # 데이터베이스 테이블 생성
 Base.metadata.create_all(bind=engine)
+# 통합 검색 인덱스 (SQLite FTS5 / PostgreSQL pg_trgm, 없으면 생성)
+search_index.ensure(engine)
 
 app = FastAPI(
     title="음샘 밴드 동아리 API",
@@ -35,27 +42,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    # 브라우저에서 읽을 수 있도록 노출할 커스텀 응답 헤더
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "Server-Timing"],
 )
 
-# 정적 파일 서빙
-if not os.path.exists("static"):
-    os.makedirs("static")
-if not os.path.exists("static/gallery"):
-    os.makedirs("static/gallery")
+# 쓰기 요청 직후의 읽기는 복제본 지연을 피하기 위해 기본 DB에서 처리
+@app.middleware("http")
+async def track_recent_writes(request: Request, call_next):
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        mark_recent_write(request)
+    return response
 
-# 정적 파일 요청 로깅을 위한 미들웨어
+# API 요청별 SQL 쿼리 수/DB 시간 측정 (Server-Timing 헤더, 느린 요청 로그, 라우트별 통계)
 @app.middleware("http")
-async def log_static_requests(request: Request, call_next):
-    if request.url.path.startswith("/static/"):
-        print(f"정적 파일 요청: {request.url.path}")
-        print(f"정적 파일 전체 URL: {request.url}")
-    elif request.url.path.startswith("/gallery/"):
-        print(f"갤러리 파일 요청 (리다이렉트): {request.url.path}")
-        print(f"갤러리 파일 전체 URL: {request.url}")
+async def sql_instrumentation(request: Request, call_next):
+    if not request.url.path.startswith("/api/"):
+        return await call_next(request)
     
+    stats = sql_metrics.begin_request()
+    start = time.perf_counter()
     response = await call_next(request)
+    total_ms = (time.perf_counter() - start) * 1000
+    
+    # 경로 파라미터 대신 라우트 템플릿 기준으로 집계 (/api/posts/{post_id})
+    # 일치하는 라우트가 없는 요청(404 등)은 URL마다 통계 항목이 늘지 않도록 하나로 묶음
+    route = request.scope.get("route")
+    path = getattr(route, "path", sql_metrics.UNMATCHED_ROUTE)
+    sql_metrics.end_request(stats, sql_metrics.route_method(request.method), path, total_ms)
+    response.headers["Server-Timing"] = stats.server_timing(total_ms)
     return response
 
+# 접근 로그 (샘플링 + 별도 스레드 출력, ACCESS_LOG_* 환경변수로 설정)
+@app.on_event("startup")
+async def start_access_log():
+    access_log.start_access_log()
+
+@app.on_event("shutdown")
+async def stop_access_log():
+    access_log.stop_access_log()
+
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    duration_ms = (time.perf_counter() - start) * 1000
+    client = request.client.host if request.client else "-"
+    access_log.log_request(request.method, request.url.path, response.status_code, duration_ms, client)
+    return response
+
+# 정적 파일 서빙
+if not os.path.exists("static"):
+    os.makedirs("static")
+if not os.path.exists("static/gallery"):
+    os.makedirs("static/gallery")
+
 # 환경변수로 정적 파일 경로 설정 (Railway Volume 사용 시)
 STATIC_FILES_PATH = os.getenv("STATIC_FILES_PATH", "static")
 GALLERY_STORAGE_PATH = os.getenv("GALLERY_STORAGE_PATH", "static/gallery")
@@ -69,32 +110,6 @@ else:
     # 로컬 개발 환경
     app.mount("/static", StaticFiles(directory=STATIC_FILES_PATH), name="static")
 
-# 정적 파일 요청 디버깅
-@app.middleware("http")
-async def debug_static_requests(request: Request, call_next):
-    if request.url.path.startswith("/static/"):
-        import os
-        file_path = request.url.path[1:]  # /static/ 제거
-        full_path = os.path.join("static", file_path[7:])  # static/ 제거
-        
-        print(f"정적 파일 요청: {request.url.path}")
-        print(f"파일 경로: {file_path}")
-        print(f"전체 경로: {full_path}")
-        print(f"파일 존재: {os.path.exists(full_path)}")
-        
-        if os.path.exists("static"):
-            print(f"static 디렉토리 내용: {os.listdir('static')}")
-            if os.path.exists("static/gallery"):
-                print(f"gallery 디렉토리 내용: {os.listdir('static/gallery')}")
-                # 각 앨범 디렉토리 확인
-                for item in os.listdir("static/gallery"):
-                    album_path = os.path.join("static/gallery", item)
-                    if os.path.isdir(album_path):
-                        print(f"앨범 {item} 디렉토리 내용: {os.listdir(album_path)}")
-    
-    response = await call_next(request)
-    return response
-
 # 갤러리 파일 요청을 정적 파일로 리다이렉트 (제거됨)
 # 프론트엔드에서 직접 /static/ 경로로 요청하도록 수정
 
@@ -108,22 +123,7 @@ app.include_router(application_form.router, prefix="/api/application-form", tags
 app.include_router(email_test.router, prefix="/api/email", tags=["이메일 테스트"])
 app.include_router(admin.router, prefix="/api/admin", tags=["관리자"])
 app.include_router(comments.router, prefix="/api", tags=["댓글"])
-
-# 정적 파일 서빙 (프론트엔드 정적 파일들)
-# Railway에서 프론트엔드 요청이 백엔드로 라우팅되는 경우를 대비
-import os
-import shutil
-
-# 프론트엔드 빌드 파일을 백엔드로 복사
-frontend_dist_path = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'dist')
-backend_static_path = os.path.join(os.path.dirname(__file__), 'frontend_dist')
-
-if os.path.exists(frontend_dist_path):
-    # 프론트엔드 빌드 파일을 백엔드 디렉토리로 복사
-    if os.path.exists(backend_static_path):
-        shutil.rmtree(backend_static_path)
-    shutil.copytree(frontend_dist_path, backend_static_path)
-    app.mount("/", StaticFiles(directory=backend_static_path, html=True), name="frontend")
+app.include_router(search.router, prefix="/api/search", tags=["검색"])
 
 # 프론트엔드 요청을 백엔드로 리다이렉트하는 임시 해결책
 @app.get("/eumsamwebsite-production.up.railway.app/api/{path:path}")
@@ -142,17 +142,28 @@ async def proxy_frontend_post_requests(path: str, request: Request):
 # 프론트엔드에서 직접 API 호출하는 경우 처리
 # 복잡한 핸들러를 제거하고 기존 API 라우터들이 자동으로 처리하도록 함
 
-@app.get("/")
-async def root():
-    return {"message": "음샘 밴드 동아리 API 서버가 정상적으로 실행 중입니다!"}
+# 정적 파일 서빙 (프론트엔드 정적 파일들)
+# Railway에서 프론트엔드 요청이 백엔드로 라우팅되는 경우를 대비
+# 빌드 결과물을 백엔드 디렉토리로 복사하지 않고 제자리에서 서빙
+# (워커 시작/리로드마다 전체 복사하던 비용과 여러 워커가 같은 디렉토리를 지우고 쓰는 경쟁 제거)
+frontend_dist_path = os.getenv(
+    "FRONTEND_DIST_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'dist')
+)
+
+# 빌드 파일이 있으면 "/"는 마운트된 index.html이 응답, 없을 때만 API 안내 메시지
+if not os.path.isdir(frontend_dist_path):
+    @app.get("/")
+    async def root():
+        return {"message": "음샘 밴드 동아리 API 서버가 정상적으로 실행 중입니다!"}
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "message": "API 서버가 정상적으로 작동하고 있습니다."}
 
 @app.get("/api/stats")
-async def get_stats(db: Session = Depends(get_db)):
-    """홈페이지 통계 정보 조회 (공개)"""
+async def get_stats(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    """홈페이지 통계 정보 조회 (공개, If-None-Match 지원)"""
     # 승인된 사용자 수 (활성 멤버) - 삭제되지 않은 사용자만 포함
     try:
         active_members = db.query(User).filter(
@@ -164,6 +175,11 @@ async def get_stats(db: Session = Depends(get_db)):
         print(f"is_deleted 필드 없음, 기본 쿼리 사용: {e}")
         active_members = db.query(User).filter(User.is_approved == True).count()
     
+    # 나머지 값은 고정값이므로 활성 멤버 수만으로 ETag 생성
+    not_modified = conditional_response(request, response, active_members)
+    if not_modified:
+        return not_modified
+    
     return {
         "active_members": active_members,
         "monthly_performances": 100,  # 누적 공연 수
@@ -171,5 +187,11 @@ async def get_stats(db: Session = Depends(get_db)):
         "music_genres": 5000  # 누적 부원 수
     }
 
+# API 라우트를 가리지 않도록 모든 라우트 등록 이후에 마운트
+if os.path.isdir(frontend_dist_path):
+    mount_start = time.perf_counter()
+    app.mount("/", StaticFiles(directory=frontend_dist_path, html=True), name="frontend")
+    print(f"프론트엔드 빌드 파일 마운트: {frontend_dist_path} ({(time.perf_counter() - mount_start) * 1000:.2f}ms)")
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 마이그레이션 스크립트
+posts 테이블에 comment_count 필드를 추가하고 실제 댓글 수로 채웁니다.
+이미 컬럼이 있으면 실제 댓글 수와 다른 게시글만 찾아 복구합니다. (여러 번 실행해도 안전)
+
+사용법:
+  python migrate_add_comment_count.py           # 컬럼 추가 + 불일치 복구
+  python migrate_add_comment_count.py --verify  # 불일치만 확인 (있으면 종료 코드 1)
+"""
+
+import argparse
+import os
+import sys
+from sqlalchemy import create_engine, inspect, text
+
+# 환경 변수에서 데이터베이스 URL 가져오기 (없으면 로컬 SQLite)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eumsaem.db")
+
+# PostgreSQL URL을 SQLAlchemy 형식으로 변환
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+engine = create_engine(DATABASE_URL)
+
+# 저장된 댓글 수와 실제 댓글 수가 다른 게시글
+MISMATCH_QUERY = text("""
+    SELECT p.id, p.comment_count, COUNT(c.id) AS actual
+    FROM posts p
+    LEFT JOIN comments c ON c.post_id = p.id
+    GROUP BY p.id, p.comment_count
+    HAVING p.comment_count <> COUNT(c.id)
+    ORDER BY p.id
+""")
+
+def _find_mismatches(connection):
+    return connection.execute(MISMATCH_QUERY).fetchall()
+
+def _print_mismatches(rows, limit: int = 20):
+    for post_id, stored, actual in rows[:limit]:
+        print(f"  게시글 {post_id}: 저장된 값 {stored}, 실제 {actual}")
+    if len(rows) > limit:
+        print(f"  ... 외 {len(rows) - limit}건")
+
+def migrate_add_comment_count(verify_only: bool = False):
+    """comment_count 필드 추가 및 복구 마이그레이션"""
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("posts")}
+
+        if "comment_count" not in columns:
+            if verify_only:
+                print("comment_count 컬럼이 없습니다. 먼저 마이그레이션을 실행하세요.")
+                sys.exit(1)
+            with engine.begin() as connection:
+                print("comment_count 컬럼 추가 중...")
+                connection.execute(text("""
+                    ALTER TABLE posts
+                    ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0
+                """))
+
+        with engine.begin() as connection:
+            mismatches = _find_mismatches(connection)
+            if not mismatches:
+                print("모든 게시글의 댓글 수가 일치합니다.")
+                return
+
+            print(f"댓글 수가 다른 게시글 {len(mismatches)}건:")
+            _print_mismatches(mismatches)
+            if verify_only:
+                sys.exit(1)
+
+            # 불일치한 게시글만 갱신 - 조회 후 새로 달린 댓글도 반영되도록 UPDATE 안에서 다시 셈 (수정 시각은 유지)
+            print("댓글 수 복구 중...")
+            for post_id, _, _ in mismatches:
+                connection.execute(text("""
+                    UPDATE posts
+                    SET comment_count = (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+                    WHERE id = :id
+                """), {"id": post_id})
+
+        print("마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"마이그레이션 실패: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 댓글 수(comment_count) 추가/검증/복구")
+    parser.add_argument("--verify", action="store_true", help="복구하지 않고 불일치만 확인")
+    args = parser.parse_args()
+    migrate_add_comment_count(verify_only=args.verify)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 마이그레이션 스크립트
+자주 쓰는 조회 패턴(게시판/댓글/갤러리/신청 목록, 회원 통계)용 복합 인덱스를 추가합니다.
+
+PostgreSQL에서는 CREATE INDEX CONCURRENTLY로 생성하므로 운영 중인 DB에 서비스 중단 없이 적용할 수 있습니다.
+여러 번 실행해도 안전하며, 이전 실행이 중단되어 INVALID 상태로 남은 인덱스는 다시 생성합니다.
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+from sqlalchemy.schema import CreateIndex
+
+from models import Base
+
+# 환경 변수에서 데이터베이스 URL 가져오기 (없으면 로컬 SQLite)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eumsaem.db")
+
+# PostgreSQL URL을 SQLAlchemy 형식으로 변환
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+# 이번 마이그레이션에서 추가하는 인덱스 (정의는 models.py의 __table_args__ / index=True)
+NEW_INDEXES = [
+    "ix_posts_pinned_created",
+    "ix_posts_category_pinned_created",
+    "ix_comments_post_created",
+    "ix_gallery_items_album_id",
+    "ix_gallery_albums_created",
+    "ix_gallery_albums_category_created",
+    "ix_applications_status_created",
+    "ix_users_approved_active",
+]
+
+def _find_indexes():
+    indexes = {}
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in NEW_INDEXES:
+                indexes[index.name] = index
+    return [indexes[name] for name in NEW_INDEXES]
+
+def _invalid_pg_indexes(connection) -> set:
+    """이전 CONCURRENTLY 생성이 실패해 INVALID로 남은 인덱스 목록"""
+    rows = connection.execute(text("""
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid
+    """)).fetchall()
+    return {row[0] for row in rows}
+
+def migrate_add_indexes():
+    """복합 인덱스를 추가하는 마이그레이션"""
+    engine = create_engine(DATABASE_URL)
+    is_postgres = engine.dialect.name == "postgresql"
+
+    try:
+        # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 autocommit 사용
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            invalid = _invalid_pg_indexes(connection) if is_postgres else set()
+
+            for index in _find_indexes():
+                if index.name in invalid:
+                    print(f"INVALID 인덱스 재생성: {index.name}")
+                    connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+
+                if is_postgres:
+                    # 테이블 잠금 없이 생성 (쓰기 요청을 막지 않음)
+                    index.dialect_options["postgresql"]["concurrently"] = True
+
+                print(f"인덱스 생성 중: {index.name} ({index.table.name})")
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+            if is_postgres:
+                # 플래너가 새 인덱스를 바로 사용하도록 통계 갱신
+                for table_name in {index.table.name for index in _find_indexes()}:
+                    connection.execute(text(f'ANALYZE "{table_name}"'))
+            else:
+                connection.execute(text("ANALYZE"))
+
+        print("마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"마이그레이션 실패: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    migrate_add_indexes()
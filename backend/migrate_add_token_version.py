@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 마이그레이션 스크립트
+users 테이블에 token_version 필드를 추가합니다. (승인/권한 변경/삭제 시 이전 토큰 무효화용)
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, inspect, text
+
+# 환경 변수에서 데이터베이스 URL 가져오기 (없으면 로컬 SQLite)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eumsaem.db")
+
+# PostgreSQL URL을 SQLAlchemy 형식으로 변환
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+engine = create_engine(DATABASE_URL)
+
+def migrate_add_token_version():
+    """token_version 필드를 추가하는 마이그레이션"""
+    try:
+        columns = {column["name"] for column in inspect(engine).get_columns("users")}
+        if "token_version" in columns:
+            print("token_version 컬럼이 이미 있습니다.")
+            return
+
+        with engine.begin() as connection:
+            # 기본값이 있는 NOT NULL 컬럼 추가 (PostgreSQL 11+ / SQLite 모두 테이블 재작성 없음)
+            print("token_version 컬럼 추가 중...")
+            connection.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0
+            """))
+
+        print("마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"마이그레이션 실패: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    migrate_add_token_version()
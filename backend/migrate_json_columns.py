@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 마이그레이션 스크립트
+applications.form_data / application_forms.form_questions 를 JSON 문자열(Text)에서 네이티브 JSON으로 바꿉니다.
+- PostgreSQL: 컬럼을 JSONB로 변경하고 form_data에 GIN 인덱스(jsonb_path_ops) 생성
+- SQLite: 컬럼 타입은 그대로 두고(JSON1 함수는 텍스트 JSON을 그대로 읽음) 깨진 JSON만 정리
+JSON으로 읽을 수 없는 값은 NULL로 바꾸고 개수를 출력합니다.
+"""
+
+import json
+import os
+import sys
+from sqlalchemy import create_engine, inspect, text
+
+# 환경 변수에서 데이터베이스 URL 가져오기 (없으면 로컬 SQLite)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eumsaem.db")
+
+# PostgreSQL URL을 SQLAlchemy 형식으로 변환
+if DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+engine = create_engine(DATABASE_URL)
+
+JSON_COLUMNS = [
+    ("applications", "form_data"),
+    ("application_forms", "form_questions"),
+]
+
+def _clear_invalid_json(connection, table: str, column: str) -> int:
+    """JSON으로 파싱되지 않는 값(빈 문자열 포함)을 NULL로 변경"""
+    rows = connection.execute(text(
+        f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL"
+    )).fetchall()
+    invalid_ids = []
+    for row_id, value in rows:
+        if not isinstance(value, str):
+            continue
+        try:
+            json.loads(value)
+        except json.JSONDecodeError:
+            invalid_ids.append(row_id)
+    for row_id in invalid_ids:
+        connection.execute(text(f"UPDATE {table} SET {column} = NULL WHERE id = :id"), {"id": row_id})
+    return len(invalid_ids)
+
+def migrate_json_columns():
+    """JSON 컬럼 변환 마이그레이션"""
+    try:
+        inspector = inspect(engine)
+        is_postgres = engine.dialect.name == "postgresql"
+        tables = set(inspector.get_table_names())
+
+        with engine.begin() as connection:
+            for table, column in JSON_COLUMNS:
+                if table not in tables:
+                    print(f"{table} 테이블이 없습니다. 건너뜁니다.")
+                    continue
+                column_type = {c["name"]: c["type"] for c in inspector.get_columns(table)}[column]
+                if is_postgres and column_type.__class__.__name__ == "JSONB":
+                    print(f"{table}.{column} 은(는) 이미 JSONB입니다.")
+                    continue
+
+                cleared = _clear_invalid_json(connection, table, column)
+                if cleared:
+                    print(f"{table}.{column}: 잘못된 JSON {cleared}건을 NULL로 변경")
+
+                if is_postgres:
+                    print(f"{table}.{column} -> JSONB 변환 중...")
+                    connection.execute(text(
+                        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+                    ))
+
+            if is_postgres and "applications" in tables:
+                # 답변 필터(form_data @> '{"question_3": "기타"}')용 인덱스
+                print("ix_applications_form_data 인덱스 생성 중...")
+                connection.execute(text("""
+                    CREATE INDEX IF NOT EXISTS ix_applications_form_data
+                    ON applications USING gin (form_data jsonb_path_ops)
+                """))
+
+        print("마이그레이션 완료!")
+
+    except Exception as e:
+        print(f"마이그레이션 실패: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    migrate_json_columns()
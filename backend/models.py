@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Float, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
+# JSON 컬럼 (PostgreSQL은 JSONB, SQLite는 JSON1 함수로 조회) - None은 JSON null이 아닌 SQL NULL로 저장
+JSONType = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
 class User(Base):
     __tablename__ = "users"
     
@@ -19,8 +23,19 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime, nullable=True)
+    # 승인/권한 변경/삭제 시 증가 - 이전에 발급된 토큰 무효화
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # 활성 회원/승인 대기 조회용 (삭제되지 않은 사용자만 부분 인덱스)
+    __table_args__ = (
+        Index(
+            "ix_users_approved_active", is_approved, created_at,
+            postgresql_where=(is_deleted == False),
+            sqlite_where=(is_deleted == False)
+        ),
+    )
+    
     # 관계 설정 - foreign_keys 명시
     posts = relationship("Post", back_populates="author")
     applications = relationship("Application", back_populates="applicant", foreign_keys="Application.applicant_id")
@@ -35,9 +50,17 @@ class Post(Base):
     category = Column(String, nullable=False)  # 칭찬글, 정보글, 세션구인
     author_id = Column(Integer, ForeignKey("users.id"))
     is_pinned = Column(Boolean, default=False)
+    # 댓글 수 (댓글 작성/삭제 시 같은 트랜잭션에서 증감, migrate_add_comment_count.py로 검증/복구)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # 게시판 목록 정렬(고정글 우선, 최신순) 및 카테고리 필터용
+    __table_args__ = (
+        Index("ix_posts_pinned_created", is_pinned, created_at),
+        Index("ix_posts_category_pinned_created", category, is_pinned, created_at),
+    )
+    
     # 관계 설정
     author = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
@@ -52,6 +75,12 @@ class GalleryAlbum(Base):
     uploader_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # 갤러리 목록 정렬(최신순) 및 카테고리 필터용
+    __table_args__ = (
+        Index("ix_gallery_albums_created", created_at),
+        Index("ix_gallery_albums_category_created", category, created_at),
+    )
+    
     # 관계 설정
     uploader = relationship("User")
     items = relationship("GalleryItem", back_populates="album", cascade="all, delete-orphan")
@@ -63,7 +92,7 @@ class GalleryItem(Base):
     title = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
     file_type = Column(String, nullable=False)  # image, video
-    album_id = Column(Integer, ForeignKey("gallery_albums.id"))
+    album_id = Column(Integer, ForeignKey("gallery_albums.id"), index=True)  # 앨범별 아이템 로드용
     uploader_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -79,12 +108,21 @@ class Application(Base):
     motivation = Column(Text, nullable=False)
     experience = Column(Text)
     instrument = Column(String)
-    form_data = Column(Text)  # JSON 형태로 추가 질문 답변 저장
+    form_data = Column(JSONType)  # 추가 질문 답변 ({"question_3": "기타", ...})
     status = Column(String, default="pending")  # pending, approved, rejected
     created_at = Column(DateTime, default=datetime.utcnow)
     reviewed_at = Column(DateTime)
     reviewed_by = Column(Integer, ForeignKey("users.id"))  # 검토한 관리자 ID
     
+    # 상태별 신청 목록(최신순) 조회용, 답변 필터(@>)용 GIN 인덱스 (PostgreSQL만)
+    __table_args__ = (
+        Index("ix_applications_status_created", status, created_at),
+        Index(
+            "ix_applications_form_data", form_data,
+            postgresql_using="gin", postgresql_ops={"form_data": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     # 관계 설정 - foreign_keys 명시
     applicant = relationship("User", back_populates="applications", foreign_keys=[applicant_id])
     reviewer = relationship("User", foreign_keys=[reviewed_by])
@@ -111,7 +149,7 @@ class ApplicationForm(Base):
     is_active = Column(Boolean, default=True)  # 지원 활성화 여부
     max_applicants = Column(Integer, default=0)  # 최대 지원자 수 (0이면 무제한)
     current_applicants = Column(Integer, default=0)  # 현재 지원자 수
-    form_questions = Column(Text)  # JSON 형태로 질문들 저장
+    form_questions = Column(JSONType)  # 질문 목록 (FormQuestion 배열)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     updated_by = Column(Integer, ForeignKey("users.id"))  # 마지막 수정자
@@ -129,6 +167,33 @@ class Comment(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # 게시글별 댓글 목록(작성순) 조회용
+    __table_args__ = (
+        Index("ix_comments_post_created", post_id, created_at),
+    )
+    
     # 관계 설정
     post = relationship("Post")
     author = relationship("User")
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String, unique=True, index=True, nullable=False)  # 원본 토큰은 저장하지 않고 SHA-256만 저장
+    family_id = Column(String, nullable=False, index=True)  # 한 번의 로그인에서 교체되며 이어진 토큰 묶음
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)  # 교체되었거나 폐기된 시각
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # 관계 설정
+    user = relationship("User")
+
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    
+    # 인스턴스 간 공유 토큰 버킷 (RATE_LIMIT_BACKEND=database 일 때 사용)
+    key = Column(String, primary_key=True)  # "login:ip:1.2.3.4" 형식
+    tokens = Column(Float, nullable=False)  # 남은 토큰 수
+    updated_at = Column(Float, nullable=False)  # 마지막 갱신 시각 (epoch 초)
@@ -0,0 +1,58 @@
+"""
+커서(키셋) 페이지네이션 유틸리티
+정렬 키 값들을 불투명한 문자열 커서로 인코딩/디코딩합니다.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+# 다음 페이지 커서를 전달하는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# 필터 조건에 맞는 전체 행 수를 전달하는 응답 헤더
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """정렬 키 값들을 URL-safe 커서 문자열로 변환"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple:
+    """커서 문자열을 정렬 키 값들로 복원 (형식이 잘못되면 400)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor length mismatch")
+        decoded = []
+        for value, expected in zip(values, types):
+            if expected is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif expected is bool:
+                if not isinstance(value, bool):
+                    raise ValueError("invalid bool")
+                decoded.append(value)
+            else:
+                decoded.append(expected(value))
+        return tuple(decoded)
+    except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 페이지 커서입니다"
+        )
+
+
+def set_next_cursor(response: Response, rows: Sequence, limit: int, key) -> None:
+    """페이지가 가득 찼으면 마지막 행 기준의 다음 커서를 응답 헤더에 설정"""
+    if limit > 0 and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
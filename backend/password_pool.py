@@ -0,0 +1,111 @@
+"""
+비밀번호 해싱 전용 워커 풀
+bcrypt 해싱/검증은 요청당 수백 ms의 CPU를 사용하므로 이벤트 루프 밖의 전용 스레드에서 실행합니다.
+(bcrypt 확장 모듈은 계산 중 GIL을 해제하므로 스레드로도 여러 코어를 사용할 수 있음)
+동시 실행 수와 대기열 길이를 제한하고, 대기 시간/실행 시간 통계를 제공합니다.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+T = TypeVar("T")
+
+# 동시에 해싱할 수 있는 작업 수 (기본: CPU 코어 수, 최대 4)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 대기 중인 작업이 이 수를 넘으면 즉시 503 응답 (과부하 시 요청이 무한히 쌓이지 않도록)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# 대기 시간 히스토그램 구간 (밀리초)
+WAIT_BUCKETS_MS = (1, 10, 50, 100, 250, 500, 1000, 2500)
+
+
+class PasswordPoolStats:
+    """해싱 작업 대기/실행 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.pending = 0
+        self.running = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_run_ms = 0.0
+        self.wait_histogram = {bucket: 0 for bucket in WAIT_BUCKETS_MS}
+        self.wait_histogram["inf"] = 0
+
+    def record_wait(self, wait_ms: float):
+        with self._lock:
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            for bucket in WAIT_BUCKETS_MS:
+                if wait_ms <= bucket:
+                    self.wait_histogram[bucket] += 1
+                    break
+            else:
+                self.wait_histogram["inf"] += 1
+
+    def record_run(self, run_ms: float):
+        with self._lock:
+            self.completed += 1
+            self.total_run_ms += run_ms
+            self.max_run_ms = max(self.max_run_ms, run_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": PASSWORD_HASH_WORKERS,
+                "max_pending": PASSWORD_HASH_MAX_PENDING,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "pending": self.pending,
+                "running": self.running,
+                "avg_wait_ms": round(self.total_wait_ms / completed, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "avg_run_ms": round(self.total_run_ms / completed, 3),
+                "max_run_ms": round(self.max_run_ms, 3),
+                "wait_histogram_ms": {str(k): v for k, v in self.wait_histogram.items()},
+            }
+
+
+stats = PasswordPoolStats()
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+def _timed(func: Callable[..., T], submitted_at: float, *args) -> T:
+    started = time.perf_counter()
+    stats.record_wait((started - submitted_at) * 1000)
+    with stats._lock:
+        stats.pending -= 1
+        stats.running += 1
+    try:
+        return func(*args)
+    finally:
+        with stats._lock:
+            stats.running -= 1
+        stats.record_run((time.perf_counter() - started) * 1000)
+
+
+async def run_in_password_pool(func: Callable[..., T], *args) -> T:
+    """해싱 함수를 전용 워커 풀에서 실행 (대기열이 가득 차면 503)"""
+    with stats._lock:
+        if stats.pending >= PASSWORD_HASH_MAX_PENDING:
+            stats.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요",
+                headers={"Retry-After": "1"},
+            )
+        stats.submitted += 1
+        stats.pending += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, _timed, func, time.perf_counter(), *args)
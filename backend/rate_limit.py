@@ -0,0 +1,215 @@
+"""
+인증 요청 속도 제한 (토큰 버킷)
+로그인/회원가입/통합 지원 요청을 IP별, 이메일별로 제한해 bcrypt 해싱이 폭주하지 않도록 합니다.
+기본은 프로세스 메모리에 버킷을 두고, RATE_LIMIT_BACKEND=database 이면 여러 인스턴스가 DB 테이블을 공유합니다.
+"""
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import case, delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import async_engine
+from db_pool import env_bool
+from models import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# memory: 인스턴스별 제한 / database: 모든 인스턴스가 같은 버킷 사용
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_ENABLED = env_bool("RATE_LIMIT_ENABLED", True)
+# 앱 앞에 있는 신뢰할 수 있는 프록시 수 (Railway 등 프록시 1개 뒤에서는 1, 직접 노출이면 0)
+# X-Forwarded-For의 앞쪽 값은 클라이언트가 임의로 넣을 수 있으므로, 프록시가 덧붙인 오른쪽 값부터 이 수만큼만 신뢰
+RATE_LIMIT_TRUSTED_PROXY_HOPS = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "0"))
+# 메모리 버킷 최대 개수 (초과 시 가득 찬 버킷부터 정리)
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "100000"))
+# DB 버킷 중 이 시간(초) 동안 사용되지 않은 행은 정리
+RATE_LIMIT_DB_IDLE_SECONDS = int(os.getenv("RATE_LIMIT_DB_IDLE_SECONDS", "3600"))
+
+
+class RateLimit:
+    """버킷 크기(capacity)만큼 연속 요청 가능, period초마다 capacity개가 다시 채워짐"""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period  # 초당 충전량
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "RateLimit":
+        # 형식: "요청 수/초" (예: 10/60 -> 60초에 10회)
+        capacity, period = os.getenv(name, default).split("/")
+        return cls(int(capacity), float(period))
+
+
+# 엔드포인트별 제한 (IP 기준, 이메일 기준)
+# IP 제한은 넉넉하게 - 학교 와이파이처럼 여러 지원자가 하나의 NAT 주소를 공유하므로 모집 시작 직후 몰려도 막지 않음
+# (한 주소에서의 대량 요청만 차단하고, 계정별 무차별 대입은 이메일 제한이 막음)
+RATE_LIMITS: Dict[str, Dict[str, RateLimit]] = {
+    "login": {
+        "ip": RateLimit.from_env("LOGIN_RATE_LIMIT_IP", "60/60"),
+        "email": RateLimit.from_env("LOGIN_RATE_LIMIT_EMAIL", "5/60"),
+    },
+    "register": {
+        "ip": RateLimit.from_env("REGISTER_RATE_LIMIT_IP", "60/60"),
+        "email": RateLimit.from_env("REGISTER_RATE_LIMIT_EMAIL", "3/600"),
+    },
+    "integrated-application": {
+        "ip": RateLimit.from_env("APPLICATION_RATE_LIMIT_IP", "60/60"),
+        "email": RateLimit.from_env("APPLICATION_RATE_LIMIT_EMAIL", "3/600"),
+    },
+}
+
+
+class MemoryBucketStore:
+    """프로세스 메모리 토큰 버킷"""
+
+    def __init__(self, max_buckets: int):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float, RateLimit]] = {}
+
+    def _prune(self, now: float):
+        # 지금쯤 가득 찼을 버킷은 없는 것과 같으므로 제거
+        full = [
+            key for key, (tokens, updated_at, limit) in self._buckets.items()
+            if tokens + (now - updated_at) * limit.rate >= limit.capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_buckets:
+            self._buckets.clear()
+
+    async def consume(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """토큰 1개 사용 - (허용 여부, 재시도까지 남은 초)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is None:
+                if len(self._buckets) >= self.max_buckets:
+                    self._prune(now)
+                tokens = float(limit.capacity)
+            else:
+                tokens = min(limit.capacity, entry[0] + (now - entry[1]) * limit.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now, limit)
+                return True, 0.0
+            self._buckets[key] = (tokens, now, limit)
+            return False, (1 - tokens) / limit.rate
+
+
+class DatabaseBucketStore:
+    """DB 테이블 토큰 버킷 (충전과 차감을 조건부 UPDATE 한 번으로 처리)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def _insert_if_missing(self, key: str, limit: RateLimit, now: float):
+        dialect = postgresql if self.engine.dialect.name == "postgresql" else sqlite
+        return dialect.insert(RateLimitBucket).values(
+            key=key, tokens=float(limit.capacity), updated_at=now
+        ).on_conflict_do_nothing(index_elements=["key"])
+
+    async def consume(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        now = time.time()
+        refilled = RateLimitBucket.tokens + (now - RateLimitBucket.updated_at) * limit.rate
+        available = case((refilled > limit.capacity, float(limit.capacity)), else_=refilled)
+        async with self.engine.begin() as conn:
+            await conn.execute(self._insert_if_missing(key, limit, now))
+            result = await conn.execute(
+                update(RateLimitBucket)
+                .where(RateLimitBucket.key == key, available >= 1)
+                .values(tokens=available - 1, updated_at=now)
+            )
+            if random.random() < 0.01:
+                await conn.execute(delete(RateLimitBucket).where(
+                    RateLimitBucket.updated_at < now - RATE_LIMIT_DB_IDLE_SECONDS
+                ))
+        if result.rowcount == 1:
+            return True, 0.0
+        # 정확한 잔량 대신 토큰 1개가 충전되는 시간을 안내
+        return False, 1 / limit.rate
+
+
+class RateLimitStats:
+    """범위(엔드포인트:ip/email)별 허용/거부 횟수"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, scope: str, allowed: bool):
+        with self._lock:
+            entry = self._counts.setdefault(scope, {"allowed": 0, "rejected": 0})
+            entry["allowed" if allowed else "rejected"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {scope: dict(entry) for scope, entry in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = RateLimitStats()
+if RATE_LIMIT_BACKEND == "database":
+    store = DatabaseBucketStore(async_engine)
+else:
+    store = MemoryBucketStore(RATE_LIMIT_MAX_BUCKETS)
+
+
+def client_ip(request: Request) -> str:
+    """요청한 클라이언트 IP
+
+    프록시 N개 뒤에서는 X-Forwarded-For의 오른쪽에서 N번째 값(가장 바깥 프록시가 본 주소)을 사용합니다.
+    """
+    if RATE_LIMIT_TRUSTED_PROXY_HOPS > 0:
+        forwarded = [
+            host.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for host in header.split(",")
+            if host.strip()
+        ]
+        if forwarded:
+            return forwarded[max(len(forwarded) - RATE_LIMIT_TRUSTED_PROXY_HOPS, 0)]
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_rate_limit(request: Request, endpoint: str, email: Optional[str] = None):
+    """IP/이메일 버킷에서 토큰을 하나씩 사용 - 부족하면 429 (비밀번호 해싱 전에 호출)"""
+    if not RATE_LIMIT_ENABLED:
+        return
+    checks = [("ip", client_ip(request))]
+    if email:
+        checks.append(("email", email.strip().lower()))
+
+    for kind, value in checks:
+        limit = RATE_LIMITS[endpoint][kind]
+        scope = f"{endpoint}:{kind}"
+        allowed, retry_after = await store.consume(f"{scope}:{value}", limit)
+        stats.record(scope, allowed)
+        if not allowed:
+            logger.warning("요청 제한: %s (%s)", scope, value)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+
+def describe_limits() -> dict:
+    """설정된 제한 값 (관리자 조회용)"""
+    return {
+        endpoint: {
+            kind: {"capacity": limit.capacity, "period_seconds": limit.period}
+            for kind, limit in limits.items()
+        }
+        for endpoint, limits in RATE_LIMITS.items()
+    }
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from database import get_db
-from models import User
-from auth import get_current_admin_user
+from database import get_db, get_pool_stats
+from auth import get_current_admin_user, token_cache, user_cache, token_versions, TokenUser
 from railway_client import railway_client
+from sql_metrics import route_stats, SLOW_REQUEST_DB_MS
+import password_pool
+import rate_limit
 from typing import Dict
 import os
 
@@ -11,7 +13,7 @@ router = APIRouter()
 
 @router.get("/traffic-metrics")
 async def get_traffic_metrics(
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ) -> Dict:
     """실제 Railway 트래픽 메트릭 데이터 조회 (관리자만)"""
     
@@ -47,7 +49,7 @@ async def get_traffic_metrics(
 
 @router.get("/system-status")
 async def get_system_status(
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ) -> Dict:
     """시스템 상태 정보 조회 (관리자만)"""
     
@@ -71,3 +73,66 @@ async def get_system_status(
             "error": str(e),
             "timestamp": "2024-01-21T10:30:00Z"
         }
+
+@router.get("/db-pool")
+async def get_db_pool_status(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """데이터베이스 커넥션 풀 상태 및 체크아웃 통계 조회 (관리자만)"""
+    return get_pool_stats()
+
+@router.get("/sql-stats")
+async def get_sql_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """라우트별 SQL 쿼리 수/DB 시간 누적 통계 조회 (관리자만)"""
+    return {
+        "slow_request_threshold_ms": SLOW_REQUEST_DB_MS,
+        "routes": route_stats.snapshot()
+    }
+
+@router.delete("/sql-stats")
+async def reset_sql_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """라우트별 SQL 통계 초기화 (관리자만)"""
+    route_stats.reset()
+    return {"message": "SQL 통계가 초기화되었습니다"}
+
+@router.get("/auth-cache")
+async def get_auth_cache_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """인증 캐시 적중/미스 통계 조회 (관리자만)"""
+    return {
+        "token_claims": token_cache.stats(),
+        "current_user": user_cache.stats(),
+        "token_versions": token_versions.stats()
+    }
+
+@router.get("/password-pool")
+async def get_password_pool_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """비밀번호 해싱 워커 풀 대기/실행 통계 조회 (관리자만)"""
+    return password_pool.stats.snapshot()
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """로그인/가입 요청 제한 설정 및 허용/거부 횟수 조회 (관리자만)"""
+    return {
+        "backend": rate_limit.RATE_LIMIT_BACKEND,
+        "enabled": rate_limit.RATE_LIMIT_ENABLED,
+        "limits": rate_limit.describe_limits(),
+        "counters": rate_limit.stats.snapshot()
+    }
+
+@router.delete("/rate-limits")
+async def reset_rate_limit_stats(
+    current_user: TokenUser = Depends(get_current_admin_user)
+) -> Dict:
+    """요청 제한 허용/거부 횟수 초기화 (관리자만)"""
+    rate_limit.stats.reset()
+    return {"message": "요청 제한 통계가 초기화되었습니다"}
@@ -1,31 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
 from database import get_db
-from models import ApplicationForm, User, Application
-from schemas import ApplicationFormResponse, ApplicationFormUpdate, FormQuestion
-from auth import get_current_admin_user
+from models import ApplicationForm, Application
+from schemas import ApplicationFormResponse, ApplicationFormUpdate, FormQuestion, json_value
+from auth import get_current_admin_user, TokenUser
+from application_form_cache import application_form_cache, CACHE_CONTROL
+from conditional_get import conditional_response
 from datetime import datetime
-import json
 
 router = APIRouter()
 
 @router.get("", response_model=ApplicationFormResponse)
 async def get_application_form(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """신청 양식 조회 (모든 사용자 가능)"""
-    # 가장 최근의 양식 조회 (활성화 상태와 관계없이)
-    form = db.query(ApplicationForm).order_by(ApplicationForm.id.desc()).first()
+    """신청 양식 조회 (모든 사용자 가능, If-None-Match 지원)"""
+    # 가장 최근의 양식 조회 (활성화 상태와 관계없이, 캐시 사용)
+    form = application_form_cache.get(db)["latest"]
     
-    if not form:
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if form:
+        # 지원자 수는 수정 시각을 바꾸지 않고 증가하므로 지문에 함께 포함
+        not_modified = conditional_response(
+            request, response, form["id"], form["updated_at"], form["is_active"],
+            form["max_applicants"], form["current_applicants"]
+        )
+        if not_modified:
+            return not_modified
+    else:
         # 기본 양식 생성
         form = ApplicationForm(
             is_active=True,
             max_applicants=0,  # 무제한
             current_applicants=0,
-            form_questions=json.dumps([
+            form_questions=[
                 {
                     "id": 1,
                     "type": "textarea",
@@ -59,23 +71,21 @@ async def get_application_form(
                         {"value": "other", "label": "기타"}
                     ]
                 }
-            ])
+            ]
         )
         db.add(form)
         db.commit()
         db.refresh(form)
+        application_form_cache.invalidate()
     # current_applicants 값은 초기화 기능을 위해 그대로 사용 (자동 계산하지 않음)
     
-    # 디버깅을 위한 응답 데이터 로그
-    print(f"신청 양식 조회 응답: is_active={form.is_active}, max_applicants={form.max_applicants}, current_applicants={form.current_applicants}")
-    
     return form
 
 @router.put("", response_model=ApplicationFormResponse)
 async def update_application_form(
     form_update: ApplicationFormUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """신청 양식 업데이트 (관리자만)"""
     try:
@@ -92,7 +102,7 @@ async def update_application_form(
                 is_active=form_update.is_active,
                 max_applicants=form_update.max_applicants,
                 current_applicants=0,  # 새 양식은 0부터 시작
-                form_questions=form_update.form_questions,
+                form_questions=json_value(form_update.form_questions),
                 updated_by=current_user.id
             )
             db.add(form)
@@ -103,12 +113,13 @@ async def update_application_form(
             form.is_active = form_update.is_active
             form.max_applicants = form_update.max_applicants
             # current_applicants는 초기화 기능을 위해 그대로 유지
-            form.form_questions = form_update.form_questions
+            form.form_questions = json_value(form_update.form_questions)
             form.updated_by = current_user.id
             form.updated_at = datetime.utcnow()
             print("기존 양식 업데이트 완료")
         
         db.commit()
+        application_form_cache.invalidate()
         print("DB 커밋 완료")
         db.refresh(form)
         print(f"업데이트된 양식: {form}")
@@ -126,28 +137,19 @@ async def update_application_form(
 
 @router.get("/questions")
 async def get_form_questions(
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """신청 양식 질문들만 조회 (JSON 파싱된 형태)"""
-    # 가장 최근의 양식 조회 (활성화 상태와 관계없이)
-    form = db.query(ApplicationForm).order_by(ApplicationForm.id.desc()).first()
-    
-    if not form or not form.form_questions:
-        return []
-    
-    try:
-        questions = json.loads(form.form_questions)
-        print(f"질문 조회 응답: {len(questions)}개 질문, is_active={form.is_active}")
-        return questions
-    except json.JSONDecodeError:
-        print("질문 JSON 파싱 오류")
-        return []
+    # 가장 최근 양식의 질문 (파싱 결과까지 캐시)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return application_form_cache.get(db)["questions"]
 
 @router.put("/questions")
 async def update_form_questions(
     questions: List[FormQuestion],
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """신청 양식 질문들만 업데이트 (관리자만)"""
     try:
@@ -167,7 +169,7 @@ async def update_form_questions(
             print("새로운 양식 생성 중...")
             form = ApplicationForm(
                 is_active=True,
-                form_questions=json.dumps(questions_dict),
+                form_questions=questions_dict,
                 updated_by=current_user.id
             )
             db.add(form)
@@ -175,12 +177,13 @@ async def update_form_questions(
         else:
             # 기존 양식 업데이트
             print(f"기존 양식 업데이트 중... (ID: {form.id}, is_active: {form.is_active})")
-            form.form_questions = json.dumps(questions_dict)
+            form.form_questions = questions_dict
             form.updated_by = current_user.id
             form.updated_at = datetime.utcnow()
             print("기존 양식 업데이트 완료")
         
         db.commit()
+        application_form_cache.invalidate()
         db.refresh(form)
         print("DB 커밋 완료")
         
@@ -198,53 +201,17 @@ async def update_form_questions(
 
 @router.get("/status")
 async def get_application_status(
+    response: Response,
     db: Session = Depends(get_db)
 ):
-    """지원 가능 여부 확인"""
-    # 활성화된 양식이 있는지 확인 (is_active = True)
-    form = db.query(ApplicationForm).filter(ApplicationForm.is_active == True).first()
-    
-    if not form:
-        # 비활성화된 양식이라도 있는지 확인
-        inactive_form = db.query(ApplicationForm).first()
-        if inactive_form:
-            return {
-                "can_apply": False,
-                "reason": "지금은 모집 기간이 아닙니다.",
-                "max_applicants": inactive_form.max_applicants,
-                "current_applicants": inactive_form.current_applicants or 0
-            }
-        else:
-            return {
-                "can_apply": False,
-                "reason": "지원 양식이 설정되지 않았습니다.",
-                "max_applicants": 0,
-                "current_applicants": 0
-            }
-    
-    # 저장된 지원자 수 사용 (초기화 기능을 위해)
-    current_count = form.current_applicants
-    
-    # 지원 가능 여부 확인
-    if form.max_applicants > 0 and current_count >= form.max_applicants:
-        return {
-            "can_apply": False,
-            "reason": f"선착순 지원이 마감되었습니다. (현재: {current_count}/{form.max_applicants})",
-            "max_applicants": form.max_applicants,
-            "current_applicants": current_count
-        }
-    
-    return {
-        "can_apply": True,
-        "reason": "지원 가능합니다.",
-        "max_applicants": form.max_applicants,
-        "current_applicants": current_count
-    }
+    """지원 가능 여부 확인 (캐시는 복제 지연 없는 기본 DB에서 채움)"""
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return application_form_cache.status(db)
 
 @router.post("/reset-applicants")
 async def reset_applicants_count(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """지원자 수 초기화 (관리자만)"""
     print(f"지원자 수 초기화 요청 받음 - 사용자: {current_user.id}, {current_user.email}")
@@ -263,6 +230,7 @@ async def reset_applicants_count(
     form.updated_by = current_user.id
     
     db.commit()
+    application_form_cache.invalidate()
     db.refresh(form)
     
     print(f"지원자 수 초기화 완료: {form.current_applicants}/{form.max_applicants}")
@@ -1,15 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional
+import re
 from database import get_db
 from models import User, Application
 from schemas import ApplicationCreate, ApplicationResponse, ApplicationUpdate
-from auth import get_current_user, get_current_admin_user
+from auth import get_current_user, get_current_admin_user, TokenUser
 from datetime import datetime
 import asyncio
 
 router = APIRouter()
 
+# 응답에 포함되는 신청자 정보를 JOIN으로 함께 로드 (목록 조회 시 N+1 방지)
+APPLICATION_LOAD_OPTIONS = (joinedload(Application.applicant),)
+
+# 답변 필터의 질문 키 (form_data의 키, 예: question_3)
+ANSWER_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+
+def parse_answer_filters(answers: Optional[List[str]]) -> dict:
+    """"question_3:기타" 형식의 답변 필터를 {키: 값}으로 변환"""
+    filters = {}
+    for answer in answers or []:
+        key, sep, value = answer.partition(":")
+        if not sep or not ANSWER_KEY_PATTERN.match(key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="답변 필터는 '질문키:값' 형식이어야 합니다 (예: question_3:기타)"
+            )
+        filters[key] = value
+    return filters
+
+def filter_by_answers(query, db: Session, filters: dict):
+    """form_data 답변이 모두 일치하는 신청만 조회 (DB에서 필터링)"""
+    if not filters:
+        return query
+    if db.get_bind().dialect.name == "postgresql":
+        # JSONB 포함 연산자(@>) - GIN 인덱스(jsonb_path_ops) 사용
+        return query.filter(type_coerce(Application.form_data, JSONB).contains(filters))
+    # SQLite: JSON1 json_extract
+    for key, value in filters.items():
+        query = query.filter(Application.form_data[key].as_string() == value)
+    return query
+
 @router.post("", response_model=ApplicationResponse)
 async def create_application(
     application_data: ApplicationCreate,
@@ -48,7 +82,7 @@ async def get_my_application(
     current_user: User = Depends(get_current_user)
 ):
     """내 입부 신청 조회"""
-    application = db.query(Application).filter(
+    application = db.query(Application).options(*APPLICATION_LOAD_OPTIONS).filter(
         Application.applicant_id == current_user.id
     ).first()
     
@@ -65,15 +99,18 @@ async def get_applications(
     skip: int = 0,
     limit: int = 100,
     status_filter: str = None,
+    answer: Optional[List[str]] = Query(None, description="추가 질문 답변 필터 (질문키:값, 여러 개면 모두 일치)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """입부 신청 목록 조회 (관리자만)"""
+    answer_filters = parse_answer_filters(answer)
     # applicant_id가 NULL이 아닌 레코드만 조회
-    query = db.query(Application).filter(Application.applicant_id.isnot(None))
+    query = db.query(Application).options(*APPLICATION_LOAD_OPTIONS).filter(Application.applicant_id.isnot(None))
     
     if status_filter:
         query = query.filter(Application.status == status_filter)
+    query = filter_by_answers(query, db, answer_filters)
     
     applications = query.order_by(Application.created_at.desc()).offset(skip).limit(limit).all()
     return applications
@@ -82,10 +119,10 @@ async def get_applications(
 async def get_application(
     application_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """입부 신청 상세 조회 (관리자만)"""
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = db.query(Application).options(*APPLICATION_LOAD_OPTIONS).filter(Application.id == application_id).first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,7 +135,7 @@ async def get_application(
 async def delete_application(
     application_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """입부 신청 삭제 (관리자만)"""
     application = db.query(Application).filter(Application.id == application_id).first()
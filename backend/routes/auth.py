@@ -1,25 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database import get_db
-from models import User, Application, ApplicationForm
-from schemas import UserCreate, UserLogin, UserResponse, Token, IntegratedApplicationCreate
-from auth import verify_password, get_password_hash, create_access_token, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func, select, update, delete, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import User, Application, ApplicationForm, RefreshToken
+from schemas import UserCreate, UserLogin, UserResponse, Token, RefreshTokenRequest, IntegratedApplicationCreate, json_value
+from auth import (
+    verify_password_async, get_password_hash_async, create_user_access_token, get_current_user,
+    create_refresh_token, hash_refresh_token, REFRESH_TOKEN_REUSE_GRACE_SECONDS
+)
 from email_service import send_welcome_email
+from rate_limit import enforce_rate_limit
+from application_form_cache import application_form_cache
 import asyncio
+from typing import Optional
+from datetime import datetime, timedelta
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
     """회원가입"""
+    await enforce_rate_limit(request, "register", user_data.email)
     print(f"회원가입 요청 받음: {user_data.email}")
     
     # 이메일 중복 확인 (삭제되지 않은 사용자만 체크)
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).filter(
         User.email == user_data.email,
         User.is_deleted == False
-    ).first()
+    ))
     if existing_user:
         print(f"이메일 중복: {user_data.email}")
         raise HTTPException(
@@ -28,10 +37,10 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 사용자명 중복 확인 (삭제되지 않은 사용자만 체크)
-    existing_username = db.query(User).filter(
+    existing_username = await db.scalar(select(User).filter(
         User.username == user_data.username,
         User.is_deleted == False
-    ).first()
+    ))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,7 +48,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # 새 사용자 생성
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -52,8 +61,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     print(f"사용자 생성 완료: {db_user.id}, {db_user.email}")
     
     # 통합 서비스에서는 가입 시 이메일을 보내지 않음 (승인 시에만 전송)
@@ -61,29 +70,136 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
     """로그인"""
-    user = db.query(User).filter(
+    # 비밀번호 검증(bcrypt) 전에 요청 수 제한
+    await enforce_rate_limit(request, "login", user_credentials.email)
+    
+    user = await db.scalar(select(User).filter(
         User.email == user_credentials.email,
         User.is_deleted == False
-    ).first()
+    ))
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not user or not await verify_password_async(user_credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="이메일 또는 비밀번호가 올바르지 않습니다"
         )
     
-    access_token = create_access_token(data={"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
+    # 만료된 리프레시 토큰 정리 후 새 토큰 발급
+    await db.execute(delete(RefreshToken).where(
+        RefreshToken.user_id == user.id,
+        RefreshToken.expires_at < datetime.utcnow()
+    ))
+    refresh_token, db_refresh_token = create_refresh_token(user.id)
+    db.add(db_refresh_token)
+    await db.commit()
+    
+    access_token = create_user_access_token(user)
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="유효하지 않은 리프레시 토큰입니다. 다시 로그인해주세요"
+    )
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """리프레시 토큰으로 액세스 토큰 재발급 (사용한 리프레시 토큰은 새 토큰으로 교체)"""
+    now = datetime.utcnow()
+    stored = await db.scalar(select(RefreshToken).filter(
+        RefreshToken.token_hash == hash_refresh_token(data.refresh_token)
+    ))
+    if stored is None or stored.expires_at <= now:
+        raise _invalid_refresh_token()
+    
+    if stored.revoked_at is not None:
+        # 이미 교체된 토큰이 다시 사용됨 - 유출 가능성이 있으므로 같은 계열 토큰을 모두 폐기
+        # (여러 탭의 동시 갱신처럼 직후 재사용은 제외)
+        if now - stored.revoked_at > timedelta(seconds=REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+            await db.execute(update(RefreshToken).where(
+                RefreshToken.family_id == stored.family_id,
+                RefreshToken.revoked_at.is_(None)
+            ).values(revoked_at=now))
+            await db.commit()
+        raise _invalid_refresh_token()
+    
+    # 조건부 UPDATE로 교체 - 같은 토큰으로 동시에 들어온 요청 중 하나만 성공
+    result = await db.execute(update(RefreshToken).where(
+        RefreshToken.id == stored.id,
+        RefreshToken.revoked_at.is_(None)
+    ).values(revoked_at=now))
+    if result.rowcount != 1:
+        await db.rollback()
+        raise _invalid_refresh_token()
+    
+    user = await db.get(User, stored.user_id)
+    if user is None or user.is_deleted:
+        await db.commit()
+        raise _invalid_refresh_token()
+    
+    refresh_token, db_refresh_token = create_refresh_token(user.id, stored.family_id)
+    db.add(db_refresh_token)
+    await db.commit()
+    
+    # 승인/권한 변경이 반영된 최신 클레임으로 발급
+    access_token = create_user_access_token(user)
+    return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
+
+@router.post("/logout")
+async def logout(data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """로그아웃 - 리프레시 토큰(같은 로그인 계열 전체) 폐기"""
+    stored = await db.scalar(select(RefreshToken).filter(
+        RefreshToken.token_hash == hash_refresh_token(data.refresh_token)
+    ))
+    if stored is not None:
+        await db.execute(update(RefreshToken).where(
+            RefreshToken.family_id == stored.family_id,
+            RefreshToken.revoked_at.is_(None)
+        ).values(revoked_at=datetime.utcnow()))
+        await db.commit()
+    return {"message": "로그아웃되었습니다"}
+
+# 유니크 인덱스 이름 -> 컬럼 이름 (PostgreSQL 제약 위반 시 어떤 값이 중복인지 판별)
+USER_UNIQUE_INDEXES = {
+    index.name: column.name
+    for index in User.__table__.indexes if index.unique
+    for column in index.columns
+}
+
+DUPLICATE_USER_MESSAGES = {
+    "email": "이미 가입된 이메일입니다",
+    "username": "이미 사용 중인 사용자명입니다",
+    "student_id": "이미 사용 중인 학번입니다",
+}
+
+def _duplicate_user_column(error: IntegrityError) -> Optional[str]:
+    """유니크 제약 위반이 발생한 users 컬럼 (다른 제약이면 None)"""
+    orig = error.orig
+    # asyncpg는 원인 예외에, psycopg2는 diag에 제약 이름이 있음
+    constraint = getattr(getattr(orig, "__cause__", None), "constraint_name", None) \
+        or getattr(getattr(orig, "diag", None), "constraint_name", None)
+    if constraint:
+        return USER_UNIQUE_INDEXES.get(constraint)
+    # SQLite는 제약 이름 대신 "UNIQUE constraint failed: users.email" 형식으로 컬럼을 알려줌
+    message = str(orig)
+    prefix = "UNIQUE constraint failed: users."
+    if prefix in message:
+        column = message.split(prefix, 1)[1].split(",")[0].strip()
+        return column if column in DUPLICATE_USER_MESSAGES else None
+    return None
 
 @router.post("/integrated-application", response_model=UserResponse)
-async def create_integrated_application(application_data: IntegratedApplicationCreate, db: Session = Depends(get_db)):
+async def create_integrated_application(application_data: IntegratedApplicationCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
     """통합 지원/가입 (회원가입 + 지원서)"""
+    await enforce_rate_limit(request, "integrated-application", application_data.email)
     print(f"통합 지원/가입 요청 받음: {application_data.email}")
     
-    # 지원 가능 여부 확인
-    form = db.query(ApplicationForm).filter(ApplicationForm.is_active == True).first()
+    # 지원 가능 여부 사전 확인 (마감된 경우 해싱 없이 바로 거절, 최종 판정은 아래 조건부 UPDATE)
+    form = await db.scalar(select(ApplicationForm).filter(ApplicationForm.is_active == True))
+    form_id = form.id if form else None
+    max_applicants = form.max_applicants if form else 0
     if form and form.max_applicants > 0:
         # 초기화 기능을 위해 ApplicationForm.current_applicants 사용
         current_count = form.current_applicants
@@ -93,163 +209,94 @@ async def create_integrated_application(application_data: IntegratedApplicationC
                 detail=f"선착순 지원이 마감되었습니다. (현재: {current_count}/{form.max_applicants})"
             )
     
-    # 이메일 중복 확인 (삭제되지 않은 사용자만 체크)
-    print(f"이메일 중복 체크: {application_data.email}")
-    
-    # 더 안전한 중복 체크: 명시적으로 is_deleted 조건 확인
-    existing_user = db.query(User).filter(
-        User.email == application_data.email,
-        User.is_deleted == False
-    ).first()
-    
-    # 디버깅: 모든 사용자 확인
-    all_users_with_email = db.query(User).filter(User.email == application_data.email).all()
-    print(f"해당 이메일의 모든 사용자: {[(u.id, u.email, u.is_deleted) for u in all_users_with_email]}")
-    
-    if existing_user:
-        print(f"이메일 중복: {application_data.email}, is_deleted: {existing_user.is_deleted}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 가입된 이메일입니다"
-        )
-    
-    # 추가 안전장치: DB 레벨에서 다시 한번 확인
-    try:
-        # 트랜잭션 내에서 다시 한번 중복 체크
-        db.flush()  # 현재까지의 변경사항을 DB에 반영
-        existing_user_check = db.query(User).filter(
-            User.email == application_data.email,
-            User.is_deleted == False
-        ).first()
-        if existing_user_check:
-            print(f"DB 레벨 중복 체크 실패: {application_data.email}")
+    # 이메일/사용자명/학번 중복을 한 번의 쿼리로 확인 (유니크 인덱스는 삭제된 사용자도 포함)
+    conditions = [User.email == application_data.email, User.username == application_data.username]
+    if application_data.student_id:
+        conditions.append(User.student_id == application_data.student_id)
+    conflicts = (await db.execute(
+        select(User.email, User.username, User.student_id, User.is_deleted).where(or_(*conditions))
+    )).all()
+    for column in ("email", "username", "student_id"):
+        matches = [row for row in conflicts if getattr(row, column) == getattr(application_data, column)]
+        if not matches:
+            continue
+        if column == "email" and all(row.is_deleted for row in matches):
+            # 탈퇴(소프트 삭제)한 사용자의 이메일은 유니크 인덱스 때문에 재사용 불가
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="이미 가입된 이메일입니다"
+                detail="이메일이 이미 사용 중입니다. 잠시 후 다시 시도해주세요."
             )
-    except Exception as e:
-        print(f"DB 레벨 중복 체크 오류: {e}")
-        # 오류가 발생해도 계속 진행 (기존 로직 유지)
-    
-    # 사용자명 중복 확인 (삭제되지 않은 사용자만 체크)
-    print(f"사용자명 중복 체크: {application_data.username}")
-    existing_username = db.query(User).filter(
-        User.username == application_data.username,
-        User.is_deleted == False
-    ).first()
-    
-    # 디버깅: 모든 사용자 확인
-    all_users_with_username = db.query(User).filter(User.username == application_data.username).all()
-    print(f"해당 사용자명의 모든 사용자: {[(u.id, u.username, u.is_deleted) for u in all_users_with_username]}")
-    
-    if existing_username:
-        print(f"사용자명 중복: {application_data.username}, is_deleted: {existing_username.is_deleted}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="이미 사용 중인 사용자명입니다"
+            detail=DUPLICATE_USER_MESSAGES[column]
         )
+    # 비밀번호 해싱 동안 커넥션을 점유하지 않도록 읽기 트랜잭션 종료
+    await db.rollback()
     
-    # 학번 중복 확인 (학번이 있는 경우, 삭제되지 않은 사용자만 체크)
-    if application_data.student_id:
-        existing_student_id = db.query(User).filter(
-            User.student_id == application_data.student_id,
-            User.is_deleted == False
-        ).first()
-        if existing_student_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="이미 사용 중인 학번입니다"
-            )
+    hashed_password = await get_password_hash_async(application_data.password)
     
-    # 새 사용자 생성 (승인 대기 상태) - 예외 처리로 안전하게
+    # 사용자 생성 + 지원서 생성 + 선착순 자리 확보를 한 트랜잭션으로 처리
+    db_user = User(
+        email=application_data.email,
+        username=application_data.username,
+        password_hash=hashed_password,
+        real_name=application_data.real_name,
+        student_id=application_data.student_id,
+        phone_number=application_data.phone_number,
+        major=application_data.major,
+        year=application_data.year,
+        is_approved=False  # 관리자 승인 필요
+    )
     try:
-        hashed_password = get_password_hash(application_data.password)
-        db_user = User(
-            email=application_data.email,
-            username=application_data.username,
-            password_hash=hashed_password,
-            real_name=application_data.real_name,
-            student_id=application_data.student_id,
-            phone_number=application_data.phone_number,
-            major=application_data.major,
-            year=application_data.year,
-            is_approved=False  # 관리자 승인 필요
-        )
-        
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        print(f"사용자 생성 완료: {db_user.id}, {db_user.email}")
+        await db.flush()
         
-    except Exception as e:
-        db.rollback()  # 트랜잭션 롤백
-        print(f"사용자 생성 오류: {e}")
-        print(f"오류 타입: {type(e)}")
-        print(f"오류 문자열: {str(e)}")
-        
-        # 유니크 제약 조건 위반인 경우 중복 체크
-        error_str = str(e)
-        if "ix_users_email" in error_str or "duplicate key value violates unique constraint" in error_str:
-            print("이메일 중복 오류 감지, 중복 체크 수행")
-            existing_user = db.query(User).filter(
-                User.email == application_data.email,
-                User.is_deleted == False
-            ).first()
-            print(f"중복 체크 결과: {existing_user}")
-            if existing_user:
-                print(f"활성 사용자 발견: {existing_user.id}, is_deleted: {existing_user.is_deleted}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="이미 가입된 이메일입니다"
+        db.add(Application(
+            applicant_id=db_user.id,
+            motivation=application_data.motivation,
+            experience=application_data.experience,
+            instrument=application_data.instrument,
+            form_data=json_value(application_data.form_data),
+            status="pending"
+        ))
+        if form_id is not None:
+            # 정원 미만일 때만 증가 (조건 확인과 증가가 한 문장이라 동시 요청에도 정원을 넘지 않음)
+            # 행 잠금 시간을 줄이기 위해 커밋 직전에 실행
+            current_applicants = func.coalesce(ApplicationForm.current_applicants, 0)
+            admitted = await db.scalar(
+                update(ApplicationForm)
+                .where(
+                    ApplicationForm.id == form_id,
+                    or_(
+                        ApplicationForm.max_applicants <= 0,
+                        current_applicants < ApplicationForm.max_applicants
+                    )
                 )
-            else:
-                print("활성 사용자 없음, 다른 원인으로 중복 오류 발생")
-                # Soft Delete된 사용자가 있지만 여전히 유니크 제약 조건 위반
-                # 이는 데이터베이스 상태 불일치 문제
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="이메일이 이미 사용 중입니다. 잠시 후 다시 시도해주세요."
-                )
-        elif "ix_users_username" in error_str:
-            existing_username = db.query(User).filter(
-                User.username == application_data.username,
-                User.is_deleted == False
-            ).first()
-            if existing_username:
+                .values(current_applicants=current_applicants + 1)
+                .returning(ApplicationForm.current_applicants)
+            )
+            if admitted is None:
+                await db.rollback()
+                application_form_cache.invalidate()
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="이미 사용 중인 사용자명입니다"
+                    detail=f"선착순 지원이 마감되었습니다. (현재: {max_applicants}/{max_applicants})"
                 )
-        elif "ix_users_student_id" in error_str:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="이미 사용 중인 학번입니다"
-            )
-        
-        # 다른 오류는 그대로 전파
-        raise e
-    
-    # 지원서 생성
-    db_application = Application(
-        applicant_id=db_user.id,
-        motivation=application_data.motivation,
-        experience=application_data.experience,
-        instrument=application_data.instrument,
-        form_data=application_data.form_data,
-        status="pending"
-    )
-    
-    db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
-    print(f"지원서 생성 완료: {db_application.id}")
-    
-    # ApplicationForm의 current_applicants 증가
-    form = db.query(ApplicationForm).filter(ApplicationForm.is_active == True).first()
-    if form:
-        form.current_applicants += 1
-        db.commit()
-        print(f"지원자 수 증가: {form.current_applicants}")
+        await db.commit()
+        if form_id is not None:
+            # 지원 현황 캐시에 새 지원자 수 반영
+            application_form_cache.record_admission(form_id, admitted)
+    except IntegrityError as e:
+        # 중복 확인 이후 동시에 같은 값으로 가입한 경우 - DB 제약으로 판별
+        await db.rollback()
+        column = _duplicate_user_column(e)
+        if column is None:
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=DUPLICATE_USER_MESSAGES[column]
+        )
+    print(f"사용자 생성 완료: {db_user.id}, {db_user.email}")
     
     # 통합 서비스에서는 가입 시 이메일을 보내지 않음 (승인 시에만 전송)
     
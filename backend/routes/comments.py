@@ -1,40 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import Comment, Post, User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, update, delete, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from database import get_async_db, get_async_read_db
+from models import Comment, Post
 from schemas import CommentCreate, CommentUpdate, CommentResponse
-from auth import get_current_active_user
+from auth import get_current_active_user, TokenUser
+from pagination import decode_cursor, set_next_cursor, TOTAL_COUNT_HEADER
+from conditional_get import conditional_response
+from datetime import datetime
 
 router = APIRouter()
 
+# 작성자는 다대일 관계라 JOIN으로 한 번에 로드
+COMMENT_LOAD_OPTIONS = (joinedload(Comment.author),)
+
+def _change_comment_count(post_id: int, amount: int):
+    """게시글 댓글 수 증감 (DB에서 원자적으로 계산, 수정 시각은 유지)"""
+    stmt = update(Post).where(Post.id == post_id)
+    if amount < 0:
+        stmt = stmt.where(Post.comment_count >= -amount)
+    return stmt.values(comment_count=Post.comment_count + amount, updated_at=Post.updated_at)
+
+async def _load_comment(db: AsyncSession, comment_id: int) -> Optional[Comment]:
+    """작성자 정보까지 함께 로드한 댓글 조회"""
+    result = await db.execute(
+        select(Comment)
+        .options(*COMMENT_LOAD_OPTIONS)
+        .filter(Comment.id == comment_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
 async def get_comments(
     post_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    latest: bool = False,
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """특정 게시글의 댓글 목록 조회"""
+    """특정 게시글의 댓글 목록 조회 (작성순)
+    
+    (created_at, id) 기준 키셋 페이지네이션으로 한 번에 limit개까지 반환하고,
+    다음 페이지 커서는 X-Next-Cursor, 전체 댓글 수는 X-Total-Count 응답 헤더로 전달됩니다.
+    latest=true이면 최신 댓글 limit개를 작성순으로 반환하고, 커서는 그보다 이전 댓글 페이지를 가리킵니다.
+    댓글 수/최대 id/최근 수정 시각으로 ETag를 만들어 변경이 없으면 304를 반환합니다.
+    """
     # 게시글이 존재하는지 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="게시글을 찾을 수 없습니다"
         )
     
-    comments = db.query(Comment).filter(Comment.post_id == post_id).order_by(Comment.created_at.asc()).all()
-    return comments
+    # 작성(최대 id), 삭제(댓글 수), 수정(최근 수정 시각)을 모두 반영하는 지문
+    last_id, last_updated_at = (await db.execute(
+        select(func.max(Comment.id), func.max(Comment.updated_at)).filter(Comment.post_id == post_id)
+    )).one()
+    not_modified = conditional_response(request, response, post_id, post.comment_count, last_id, last_updated_at)
+    if not_modified:
+        return not_modified
+    
+    query = select(Comment).options(*COMMENT_LOAD_OPTIONS).filter(Comment.post_id == post_id)
+    position = tuple_(Comment.created_at, Comment.id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, (datetime, int))
+        query = query.filter(position < (created_at, last_id) if latest else position > (created_at, last_id))
+    
+    if latest:
+        order = (Comment.created_at.desc(), Comment.id.desc())
+    else:
+        order = (Comment.created_at.asc(), Comment.id.asc())
+    result = await db.execute(query.order_by(*order).limit(limit))
+    comments = result.scalars().all()
+    
+    # latest 모드는 최신순으로 읽었으므로 마지막 행(가장 오래된 댓글)이 다음(이전) 페이지 기준
+    set_next_cursor(response, comments, limit, lambda c: (c.created_at, c.id))
+    # 전체 수는 게시글에 저장된 댓글 수 사용 (COUNT 쿼리 없음)
+    response.headers[TOTAL_COUNT_HEADER] = str(post.comment_count)
+    return list(reversed(comments)) if latest else comments
 
 @router.post("/posts/{post_id}/comments", response_model=CommentResponse)
 async def create_comment(
     post_id: int,
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """댓글 작성"""
     # 게시글이 존재하는지 확인
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,20 +109,20 @@ async def create_comment(
     )
     
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.execute(_change_comment_count(post_id, 1))
+    await db.commit()
     
-    return comment
+    return await _load_comment(db, comment.id)
 
 @router.put("/comments/{comment_id}", response_model=CommentResponse)
 async def update_comment(
     comment_id: int,
     comment_update: CommentUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """댓글 수정"""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -77,19 +137,18 @@ async def update_comment(
         )
     
     comment.content = comment_update.content
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
     
-    return comment
+    return await _load_comment(db, comment.id)
 
 @router.delete("/comments/{comment_id}")
 async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """댓글 삭제"""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
     if not comment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -103,7 +162,10 @@ async def delete_comment(
             detail="댓글을 삭제할 권한이 없습니다"
         )
     
-    db.delete(comment)
-    db.commit()
+    # 동시에 같은 댓글을 삭제해도 실제로 지운 요청만 댓글 수를 줄임
+    result = await db.execute(delete(Comment).where(Comment.id == comment_id))
+    if result.rowcount == 1:
+        await db.execute(_change_comment_count(comment.post_id, -1))
+    await db.commit()
     
     return {"message": "댓글이 삭제되었습니다"}
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from email_service import send_welcome_email
-from auth import get_current_admin_user
-from models import User
+from auth import get_current_admin_user, TokenUser
 from email_config import email_settings
 import smtplib
 import ssl
@@ -12,7 +11,7 @@ router = APIRouter()
 async def test_welcome_email(
     email: str,
     name: str = "테스트 사용자",
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """환영 이메일 테스트 (관리자만)"""
     try:
@@ -36,7 +35,7 @@ async def test_welcome_email(
 
 @router.get("/smtp-test")
 async def test_smtp_connection(
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """SMTP 연결 테스트 (관리자만)"""
     if not email_settings:
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
+from sqlalchemy import select, func, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional
-from database import get_db
+from database import get_async_db, get_async_read_db
 from models import User, GalleryAlbum, GalleryItem
-from schemas import GalleryAlbumCreate, GalleryAlbumResponse, GalleryItemResponse
-from auth import get_current_active_user, get_current_user_optional
+from schemas import GalleryAlbumCreate, GalleryAlbumResponse, GalleryItemResponse, GalleryAlbumSummaryResponse, UserResponse
+from auth import get_current_active_user, get_current_user_optional, TokenUser
+from pagination import decode_cursor, set_next_cursor, TOTAL_COUNT_HEADER
+from conditional_get import conditional_response
 import os
 import uuid
 from datetime import datetime
@@ -14,31 +18,160 @@ GALLERY_STORAGE_PATH = os.getenv("GALLERY_STORAGE_PATH", "static/gallery")
 
 router = APIRouter()
 
+# 응답 직렬화에 필요한 관계를 미리 로드
+# - 앨범 업로더: JOIN (다대일)
+# - 아이템: 앨범 id IN (...) 한 번, 아이템 업로더는 그 쿼리에 JOIN
+# 앨범 수/아이템 수와 무관하게 쿼리 2회로 고정
+ALBUM_LOAD_OPTIONS = (
+    joinedload(GalleryAlbum.uploader),
+    selectinload(GalleryAlbum.items).joinedload(GalleryItem.uploader),
+)
+
+# 목록 정렬: 최신순 (id는 동일 시각 정렬 안정화용)
+ALBUM_LIST_ORDER = (GalleryAlbum.created_at.desc(), GalleryAlbum.id.desc())
+
+def _filter_album_list(query, category: Optional[str], cursor: Optional[str], skip: int):
+    """카테고리 필터와 페이지 위치(커서 또는 skip) 적용"""
+    if category:
+        query = query.filter(GalleryAlbum.category == category)
+    
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, (datetime, int))
+        return query.filter(tuple_(GalleryAlbum.created_at, GalleryAlbum.id) < (created_at, last_id))
+    return query.offset(skip)
+
+async def _album_fingerprint(db: AsyncSession, album_id: int):
+    """상세 조회 ETag 지문: 앨범 정보 + 업로더 정보 + 아이템 수/최대 id/최근 업로드 시각 (아이템 행은 읽지 않음)"""
+    items = (
+        select(
+            func.count(GalleryItem.id).label("item_count"),
+            func.max(GalleryItem.id).label("last_item_id"),
+            func.max(GalleryItem.created_at).label("last_item_at"),
+        )
+        .filter(GalleryItem.album_id == album_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            GalleryAlbum.title, GalleryAlbum.description, GalleryAlbum.category,
+            GalleryAlbum.created_at.label("album_created_at"),
+            *(getattr(User, field) for field in UserResponse.model_fields),
+            items.c.item_count, items.c.last_item_id, items.c.last_item_at,
+        )
+        .outerjoin(User, GalleryAlbum.uploader_id == User.id)
+        .join(items, true())
+        .filter(GalleryAlbum.id == album_id)
+    )
+    return result.first()
+
+async def _load_album(db: AsyncSession, album_id: int) -> Optional[GalleryAlbum]:
+    """응답에 필요한 관계까지 함께 로드한 앨범 조회"""
+    result = await db.execute(
+        select(GalleryAlbum)
+        .options(*ALBUM_LOAD_OPTIONS)
+        .filter(GalleryAlbum.id == album_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.get("", response_model=List[GalleryAlbumResponse])
 async def get_gallery_albums(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     category: str = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """갤러리 앨범 목록 조회 (누구나 조회 가능)"""
+    """갤러리 앨범 목록 조회 (누구나 조회 가능)
+    
+    cursor를 넘기면 (created_at, id) 기준 키셋 페이지네이션으로 동작하고 skip은 무시됩니다.
+    다음 페이지 커서는 X-Next-Cursor 응답 헤더로 전달됩니다.
+    """
     
-    query = db.query(GalleryAlbum)
+    query = _filter_album_list(select(GalleryAlbum).options(*ALBUM_LOAD_OPTIONS), category, cursor, skip)
     
+    result = await db.execute(query.order_by(*ALBUM_LIST_ORDER).limit(limit))
+    albums = result.scalars().all()
+    set_next_cursor(response, albums, limit, lambda a: (a.created_at, a.id))
+    return albums
+
+@router.get("/summary", response_model=List[GalleryAlbumSummaryResponse])
+async def get_gallery_album_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    category: str = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """갤러리 목록용 앨범 요약 조회 (누구나 조회 가능)
+    
+    앨범별 전체 아이템 대신 대표 아이템 1개와 아이템 수만 컬럼 단위로 조회합니다.
+    전체 앨범 수는 X-Total-Count 응답 헤더로 전달됩니다.
+    """
+    item_count = (
+        select(func.count(GalleryItem.id))
+        .filter(GalleryItem.album_id == GalleryAlbum.id)
+        .correlate(GalleryAlbum)
+        .scalar_subquery()
+    )
+    # 대표 아이템은 앨범에 처음 업로드된 아이템
+    cover_item_id = (
+        select(func.min(GalleryItem.id))
+        .filter(GalleryItem.album_id == GalleryAlbum.id)
+        .correlate(GalleryAlbum)
+        .scalar_subquery()
+    )
+    query = select(
+        GalleryAlbum.id,
+        GalleryAlbum.title,
+        GalleryAlbum.description,
+        GalleryAlbum.category,
+        GalleryAlbum.uploader_id,
+        User.username.label("uploader_name"),
+        GalleryAlbum.created_at,
+        item_count.label("item_count"),
+        cover_item_id.label("cover_item_id")
+    ).outerjoin(User, GalleryAlbum.uploader_id == User.id)
+    query = _filter_album_list(query, category, cursor, skip)
+    
+    result = await db.execute(query.order_by(*ALBUM_LIST_ORDER).limit(limit))
+    rows = result.all()
+    
+    cover_ids = [row.cover_item_id for row in rows if row.cover_item_id is not None]
+    covers = {}
+    if cover_ids:
+        cover_result = await db.execute(
+            select(GalleryItem.id, GalleryItem.file_path, GalleryItem.file_type)
+            .filter(GalleryItem.id.in_(cover_ids))
+        )
+        covers = {item.id: item._asdict() for item in cover_result.all()}
+    
+    count_query = select(func.count(GalleryAlbum.id))
     if category:
-        query = query.filter(GalleryAlbum.category == category)
+        count_query = count_query.filter(GalleryAlbum.category == category)
+    response.headers[TOTAL_COUNT_HEADER] = str(await db.scalar(count_query))
     
-    albums = query.order_by(GalleryAlbum.created_at.desc()).offset(skip).limit(limit).all()
+    set_next_cursor(response, rows, limit, lambda a: (a.created_at, a.id))
+    albums = []
+    for row in rows:
+        album = row._asdict()
+        album["cover_item"] = covers.get(album.pop("cover_item_id"))
+        albums.append(album)
     return albums
 
 @router.get("/{album_id}", response_model=GalleryAlbumResponse)
 async def get_gallery_album(
     album_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
-    """갤러리 앨범 상세 조회 (승인된 사용자만)"""
+    """갤러리 앨범 상세 조회 (승인된 사용자만, If-None-Match 지원)"""
     # 승인된 사용자만 조회 가능
     if not current_user.is_approved:
         raise HTTPException(
@@ -46,7 +179,13 @@ async def get_gallery_album(
             detail="관리자 승인 후 갤러리를 이용할 수 있습니다"
         )
     
-    album = db.query(GalleryAlbum).filter(GalleryAlbum.id == album_id).first()
+    fingerprint = await _album_fingerprint(db, album_id)
+    if fingerprint:
+        not_modified = conditional_response(request, response, album_id, *fingerprint)
+        if not_modified:
+            return not_modified
+    
+    album = await _load_album(db, album_id)
     if not album:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,8 +199,8 @@ async def create_gallery_album(
     description: str = Form(None),
     category: str = Form("기타"),
     files: List[UploadFile] = File(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """갤러리 앨범 생성 (관리자만)"""
     # 관리자만 업로드 가능
@@ -113,8 +252,7 @@ async def create_gallery_album(
     )
     
     db.add(album)
-    db.commit()
-    db.refresh(album)
+    await db.commit()
     
     # 디렉토리 생성 (환경변수 사용)
     album_dir = f"{GALLERY_STORAGE_PATH}/{album.id}"
@@ -166,10 +304,9 @@ async def create_gallery_album(
             db.add(gallery_item)
             uploaded_files.append(file_path)
         
-        db.commit()
-        db.refresh(album)
+        await db.commit()
         
-        return album
+        return await _load_album(db, album.id)
         
     except Exception as e:
         # 파일 저장 실패 시 생성된 파일들 삭제
@@ -181,9 +318,10 @@ async def create_gallery_album(
         if os.path.exists(album_dir):
             os.rmdir(album_dir)
         
-        # 데이터베이스에서 앨범 삭제
-        db.delete(album)
-        db.commit()
+        # 데이터베이스에서 앨범 삭제 (추가 중이던 아이템은 롤백)
+        await db.rollback()
+        await db.delete(album)
+        await db.commit()
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -193,11 +331,16 @@ async def create_gallery_album(
 @router.delete("/{album_id}")
 async def delete_gallery_album(
     album_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """갤러리 앨범 삭제"""
-    album = db.query(GalleryAlbum).filter(GalleryAlbum.id == album_id).first()
+    result = await db.execute(
+        select(GalleryAlbum)
+        .options(selectinload(GalleryAlbum.items))
+        .filter(GalleryAlbum.id == album_id)
+    )
+    album = result.scalars().first()
     if not album:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -253,7 +396,7 @@ async def delete_gallery_album(
             print(f"강제 디렉토리 삭제 완료: {album_dir}")
     
     # 데이터베이스에서 삭제 (cascade로 items도 함께 삭제됨)
-    db.delete(album)
-    db.commit()
+    await db.delete(album)
+    await db.commit()
     
     return {"message": "갤러리 앨범이 삭제되었습니다"}
\ No newline at end of file
@@ -1,38 +1,128 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List, Optional
-from database import get_db
+from datetime import datetime
+from database import get_async_db, get_async_read_db
 from models import User, Post
-from schemas import PostCreate, PostResponse, PostUpdate
-from auth import get_current_active_user, get_current_user_optional
+from schemas import PostCreate, PostResponse, PostUpdate, PostSummaryResponse, UserResponse
+from auth import get_current_active_user, get_current_user_optional, TokenUser
+from pagination import decode_cursor, set_next_cursor, TOTAL_COUNT_HEADER
+from conditional_get import conditional_response
 
 router = APIRouter()
 
+# 작성자는 다대일 관계라 JOIN으로 한 번에 로드 (목록/상세 모두 쿼리 1회)
+POST_LOAD_OPTIONS = (joinedload(Post.author),)
+
+# 목록 정렬: 고정글 우선, 최신순 (id는 동일 시각 정렬 안정화용)
+POST_LIST_ORDER = (Post.is_pinned.desc(), Post.created_at.desc(), Post.id.desc())
+
+# 요약 목록에 포함할 본문 앞부분 길이
+EXCERPT_LENGTH = 120
+
+# 상세 조회 ETag 지문: 수정 시각/댓글 수/고정 여부 + 응답에 포함되는 작성자 정보 (본문은 읽지 않음)
+POST_FINGERPRINT = (
+    Post.updated_at, Post.comment_count, Post.is_pinned,
+    *(getattr(User, field) for field in UserResponse.model_fields),
+)
+
+def _filter_post_list(query, category: Optional[str], cursor: Optional[str], skip: int):
+    """카테고리 필터와 페이지 위치(커서 또는 skip) 적용"""
+    if category:
+        query = query.filter(Post.category == category)
+    
+    if cursor:
+        is_pinned, created_at, last_id = decode_cursor(cursor, (bool, datetime, int))
+        return query.filter(
+            tuple_(Post.is_pinned, Post.created_at, Post.id) < (is_pinned, created_at, last_id)
+        )
+    return query.offset(skip)
+
+async def _load_post(db: AsyncSession, post_id: int) -> Optional[Post]:
+    """작성자 정보까지 함께 로드한 게시글 조회"""
+    result = await db.execute(
+        select(Post)
+        .options(*POST_LOAD_OPTIONS)
+        .filter(Post.id == post_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.get("", response_model=List[PostResponse])
 async def get_posts(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: Optional[User] = Depends(get_current_user_optional)
 ):
-    """게시글 목록 조회 (누구나 조회 가능)"""
+    """게시글 목록 조회 (누구나 조회 가능)
     
-    query = db.query(Post)
+    cursor를 넘기면 (is_pinned, created_at, id) 기준 키셋 페이지네이션으로 동작하고 skip은 무시됩니다.
+    다음 페이지 커서는 X-Next-Cursor 응답 헤더로 전달됩니다.
+    """
     
-    if category:
-        query = query.filter(Post.category == category)
+    query = _filter_post_list(select(Post).options(*POST_LOAD_OPTIONS), category, cursor, skip)
     
-    posts = query.order_by(Post.is_pinned.desc(), Post.created_at.desc()).offset(skip).limit(limit).all()
+    result = await db.execute(query.order_by(*POST_LIST_ORDER).limit(limit))
+    posts = result.scalars().all()
+    set_next_cursor(response, posts, limit, lambda p: (p.is_pinned, p.created_at, p.id))
     return posts
 
+@router.get("/summary", response_model=List[PostSummaryResponse])
+async def get_post_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 20,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Optional[User] = Depends(get_current_user_optional)
+):
+    """게시판 목록용 게시글 요약 조회 (누구나 조회 가능)
+    
+    본문 전체 대신 앞부분(excerpt), 작성자 이름, 댓글 수만 필요한 컬럼 단위로 조회합니다.
+    댓글 수는 게시글에 저장된 값(comment_count)을 그대로 사용합니다.
+    전체 게시글 수는 X-Total-Count 응답 헤더로 전달됩니다.
+    """
+    query = select(
+        Post.id,
+        Post.title,
+        func.substr(Post.content, 1, EXCERPT_LENGTH).label("excerpt"),
+        Post.category,
+        Post.is_pinned,
+        Post.author_id,
+        User.username.label("author_name"),
+        Post.comment_count,
+        Post.created_at,
+        Post.updated_at
+    ).outerjoin(User, Post.author_id == User.id)
+    query = _filter_post_list(query, category, cursor, skip)
+    
+    result = await db.execute(query.order_by(*POST_LIST_ORDER).limit(limit))
+    rows = result.all()
+    
+    count_query = select(func.count(Post.id))
+    if category:
+        count_query = count_query.filter(Post.category == category)
+    response.headers[TOTAL_COUNT_HEADER] = str(await db.scalar(count_query))
+    
+    set_next_cursor(response, rows, limit, lambda p: (p.is_pinned, p.created_at, p.id))
+    return [row._asdict() for row in rows]
+
 @router.get("/{post_id}", response_model=PostResponse)
 async def get_post(
     post_id: int, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
-    """게시글 상세 조회 (승인된 사용자만)"""
+    """게시글 상세 조회 (승인된 사용자만, If-None-Match 지원)"""
     # 승인되지 않은 사용자는 게시판 접근 불가
     if not current_user.is_approved:
         raise HTTPException(
@@ -40,7 +130,15 @@ async def get_post(
             detail="관리자 승인 후 커뮤니티를 이용할 수 있습니다"
         )
     
-    post = db.query(Post).filter(Post.id == post_id).first()
+    fingerprint = (await db.execute(
+        select(*POST_FINGERPRINT).outerjoin(User, Post.author_id == User.id).filter(Post.id == post_id)
+    )).first()
+    if fingerprint:
+        not_modified = conditional_response(request, response, post_id, *fingerprint)
+        if not_modified:
+            return not_modified
+    
+    post = await _load_post(db, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,8 +149,8 @@ async def get_post(
 @router.post("", response_model=PostResponse)
 async def create_post(
     post_data: PostCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """게시글 작성 (승인된 사용자만)"""
     # 승인되지 않은 사용자는 글 작성 불가
@@ -70,20 +168,19 @@ async def create_post(
     )
     
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.commit()
     
-    return post
+    return await _load_post(db, post.id)
 
 @router.put("/{post_id}", response_model=PostResponse)
 async def update_post(
     post_id: int,
     post_update: PostUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """게시글 수정"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -101,19 +198,18 @@ async def update_post(
     for field, value in update_data.items():
         setattr(post, field, value)
     
-    db.commit()
-    db.refresh(post)
+    await db.commit()
     
-    return post
+    return await _load_post(db, post.id)
 
 @router.delete("/{post_id}")
 async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """게시글 삭제"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,16 +223,16 @@ async def delete_post(
             detail="게시글을 삭제할 권한이 없습니다"
         )
     
-    db.delete(post)
-    db.commit()
+    await db.delete(post)
+    await db.commit()
     
     return {"message": "게시글이 삭제되었습니다"}
 
 @router.post("/{post_id}/pin")
 async def toggle_pin_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TokenUser = Depends(get_current_active_user)
 ):
     """게시글 고정/해제 (관리자만)"""
     if not current_user.is_admin:
@@ -145,7 +241,7 @@ async def toggle_pin_post(
             detail="관리자 권한이 필요합니다"
         )
     
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,6 +249,6 @@ async def toggle_pin_post(
         )
     
     post.is_pinned = not post.is_pinned
-    db.commit()
+    await db.commit()
     
     return {"message": f"게시글이 {'고정' if post.is_pinned else '고정 해제'}되었습니다"}
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_read_db
+from schemas import SearchResultResponse
+from auth import get_current_active_user, TokenUser
+from pagination import TOTAL_COUNT_HEADER
+from search_index import search_index, split_terms, highlight, SEARCH_TYPES, SNIPPET_LENGTH
+
+router = APIRouter()
+
+@router.get("", response_model=List[SearchResultResponse])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=100, description="검색어 (공백으로 구분하면 모두 포함된 결과)"),
+    type: Optional[List[str]] = Query(None, description="검색 대상 (post, comment, album - 여러 개 지정 가능)"),
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: TokenUser = Depends(get_current_active_user)
+):
+    """게시글/댓글/갤러리 통합 검색 (승인된 사용자만)
+
+    관련도 순(같으면 최신순)으로 정렬하며, 전체 결과 수는 X-Total-Count 응답 헤더로 전달됩니다.
+    """
+    if not current_user.is_approved:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 승인 후 커뮤니티를 이용할 수 있습니다"
+        )
+
+    types = type or list(SEARCH_TYPES)
+    unknown = [t for t in types if t not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 검색 대상입니다: {', '.join(unknown)} (가능: {', '.join(SEARCH_TYPES)})"
+        )
+
+    terms = split_terms(q)
+    if not terms:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="검색어를 입력해주세요"
+        )
+
+    results = search_index.build(q.strip(), terms, list(dict.fromkeys(types)))
+    rows = (await db.execute(
+        select(results)
+        .order_by(results.c.score.desc(), results.c.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )).all()
+    response.headers[TOTAL_COUNT_HEADER] = str(await db.scalar(select(func.count()).select_from(results)))
+
+    return [
+        {
+            "type": row.type,
+            "id": row.id,
+            "post_id": row.post_id,
+            "title": row.title,
+            "title_highlight": highlight(row.title, terms),
+            "snippet": highlight(row.body, terms, SNIPPET_LENGTH),
+            "category": row.category,
+            "created_at": row.created_at,
+            "score": row.score or 0.0,
+        }
+        for row in rows
+    ]
@@ -3,20 +3,58 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List
 from database import get_db
-from models import User, Post, GalleryItem, Application
+from models import User, Post, Comment, GalleryItem, Application, RefreshToken
 from schemas import UserResponse, UserUpdate, PasswordChange, UserDelete, UserRoleUpdate
-from auth import get_current_user, get_current_admin_user, verify_password, get_password_hash
+from auth import get_current_user, get_current_admin_user, verify_password_async, get_password_hash_async, invalidate_cached_user, bump_token_version, revoke_refresh_tokens, TokenUser
+from token_versions import REVOKED
 from email_service import send_integrated_approval_email
 import asyncio
 
 router = APIRouter()
 
+def _delete_user_data(db: Session, user_id: int):
+    """사용자와 관련 데이터 삭제 (커밋은 호출하는 쪽에서)"""
+    own_posts = db.query(Post.id).filter(Post.author_id == user_id)
+    
+    # 다른 사람 게시글에 남긴 댓글 수만큼 해당 게시글의 댓글 수 감소 (수정 시각은 유지)
+    removed_counts = (
+        db.query(Comment.post_id, func.count(Comment.id))
+        .filter(Comment.author_id == user_id, Comment.post_id.notin_(own_posts))
+        .group_by(Comment.post_id)
+        .all()
+    )
+    for post_id, count in removed_counts:
+        db.query(Post).filter(Post.id == post_id, Post.comment_count >= count).update(
+            {Post.comment_count: Post.comment_count - count, Post.updated_at: Post.updated_at},
+            synchronize_session=False
+        )
+    
+    # 댓글 삭제 (본인 댓글 + 본인 게시글에 달린 댓글) - 게시글보다 먼저 삭제해야 외래 키 위반이 없음
+    db.query(Comment).filter(
+        (Comment.author_id == user_id) | Comment.post_id.in_(own_posts)
+    ).delete(synchronize_session=False)
+    
+    # 게시글 삭제
+    db.query(Post).filter(Post.author_id == user_id).delete(synchronize_session=False)
+    
+    # 갤러리 아이템 삭제
+    db.query(GalleryItem).filter(GalleryItem.uploader_id == user_id).delete()
+    
+    # 입부 신청 삭제
+    db.query(Application).filter(Application.applicant_id == user_id).delete()
+    
+    # 리프레시 토큰 삭제
+    db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete()
+    
+    # 사용자 삭제
+    db.query(User).filter(User.id == user_id).delete()
+
 @router.get("", response_model=List[UserResponse])
 async def get_users(
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """모든 사용자 조회 (관리자만) - 삭제된 사용자 제외"""
     try:
@@ -31,7 +69,7 @@ async def get_users(
 @router.get("/pending", response_model=List[UserResponse])
 async def get_pending_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """승인 대기 사용자 조회 (관리자만) - 삭제된 사용자 제외"""
     try:
@@ -50,7 +88,7 @@ async def get_pending_users(
 async def approve_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """사용자 승인 (관리자만)"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -61,7 +99,9 @@ async def approve_user(
         )
     
     user.is_approved = True
+    token_version = bump_token_version(user)
     db.commit()
+    invalidate_cached_user(user.email, user.id, token_version)
     
     # 통합 승인 이메일 전송 (비동기) - 가입 및 지원 모두 승인됨
     try:
@@ -86,7 +126,7 @@ async def approve_user(
 async def reject_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """사용자 거부 (관리자만)"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -96,8 +136,10 @@ async def reject_user(
             detail="사용자를 찾을 수 없습니다"
         )
     
-    db.delete(user)
+    email, user_id = user.email, user.id
+    _delete_user_data(db, user_id)
     db.commit()
+    invalidate_cached_user(email, user_id, REVOKED)
     
     return {"message": "사용자가 거부되었습니다"}
 
@@ -114,6 +156,7 @@ async def update_current_user(
         setattr(current_user, field, value)
     
     db.commit()
+    invalidate_cached_user(current_user.email)
     db.refresh(current_user)
     
     return current_user
@@ -126,15 +169,18 @@ async def change_password(
 ):
     """비밀번호 변경"""
     # 현재 비밀번호 확인
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="현재 비밀번호가 올바르지 않습니다"
         )
     
     # 새 비밀번호로 변경
-    current_user.password_hash = get_password_hash(password_data.new_password)
+    current_user.password_hash = await get_password_hash_async(password_data.new_password)
+    # 모든 기기의 리프레시 토큰 폐기 (유출된 세션이 새 비밀번호 이후에도 갱신되지 않도록)
+    revoke_refresh_tokens(db, current_user.id)
     db.commit()
+    invalidate_cached_user(current_user.email)
     
     return {"message": "비밀번호가 성공적으로 변경되었습니다"}
 
@@ -146,25 +192,17 @@ async def delete_current_user(
 ):
     """현재 사용자 계정 삭제 (회원 탈퇴)"""
     # 비밀번호 확인
-    if not verify_password(delete_data.password, current_user.password_hash):
+    if not await verify_password_async(delete_data.password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="비밀번호가 올바르지 않습니다"
         )
     
-    # 관련 데이터 삭제
-    # 게시글 삭제
-    db.query(Post).filter(Post.author_id == current_user.id).delete()
-    
-    # 갤러리 아이템 삭제
-    db.query(GalleryItem).filter(GalleryItem.uploader_id == current_user.id).delete()
-    
-    # 입부 신청 삭제
-    db.query(Application).filter(Application.applicant_id == current_user.id).delete()
-    
-    # 사용자 삭제
-    db.delete(current_user)
+    # 관련 데이터와 사용자 삭제
+    email, user_id = current_user.email, current_user.id
+    _delete_user_data(db, user_id)
     db.commit()
+    invalidate_cached_user(email, user_id, REVOKED)
     
     return {"message": "계정이 성공적으로 삭제되었습니다"}
 
@@ -173,7 +211,7 @@ async def update_user_role(
     user_id: int,
     role_update: UserRoleUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """사용자 권한 변경 (관리자만)"""
     # 자신의 권한은 변경할 수 없음
@@ -191,7 +229,9 @@ async def update_user_role(
         )
     
     user.is_admin = role_update.is_admin
+    token_version = bump_token_version(user)
     db.commit()
+    invalidate_cached_user(user.email, user.id, token_version)
     db.refresh(user)
     
     return user
@@ -200,7 +240,7 @@ async def update_user_role(
 async def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """회원 삭제 (관리자만)"""
     user = db.query(User).filter(User.id == user_id).first()
@@ -235,14 +275,17 @@ async def delete_user(
     from datetime import datetime
     user.is_deleted = True
     user.deleted_at = datetime.utcnow()
+    bump_token_version(user)
+    revoke_refresh_tokens(db, user.id)
     db.commit()
+    invalidate_cached_user(user.email, user.id, REVOKED)
     
     return {"message": "회원이 성공적으로 삭제되었습니다"}
 
 @router.get("/stats")
 async def get_user_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: TokenUser = Depends(get_current_admin_user)
 ):
     """사용자 통계 조회 (관리자만)"""
     try:
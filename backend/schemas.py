@@ -1,6 +1,25 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Any, Optional, List
 from datetime import datetime
+import json
+
+def json_text(value: Any) -> Optional[str]:
+    """JSON 컬럼 값(dict/list)을 API용 JSON 문자열로 변환 (클라이언트는 문자열로 주고받음)"""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+def json_value(text: Optional[str]) -> Any:
+    """API로 받은 JSON 문자열을 JSON 컬럼에 저장할 값으로 변환"""
+    return json.loads(text) if text else None
+
+def _validate_json_text(text: Optional[str]) -> Optional[str]:
+    if text:
+        try:
+            json.loads(text)
+        except json.JSONDecodeError:
+            raise ValueError("올바른 JSON 형식이 아닙니다")
+    return text
 
 # 사용자 관련 스키마
 class UserBase(BaseModel):
@@ -60,6 +79,7 @@ class PostResponse(PostBase):
     id: int
     author_id: int
     is_pinned: bool
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
     author: UserResponse
@@ -67,6 +87,19 @@ class PostResponse(PostBase):
     class Config:
         from_attributes = True
 
+# 게시판 목록용 요약 (본문 일부와 작성자 이름만 포함)
+class PostSummaryResponse(BaseModel):
+    id: int
+    title: str
+    excerpt: str
+    category: str
+    is_pinned: bool
+    author_id: int
+    author_name: Optional[str] = None
+    comment_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
 class PostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -111,6 +144,20 @@ class GalleryAlbumResponse(GalleryAlbumBase):
     class Config:
         from_attributes = True
 
+# 갤러리 목록용 요약 (대표 이미지와 아이템 수만 포함)
+class GalleryCoverItem(BaseModel):
+    id: int
+    file_path: str
+    file_type: str
+
+class GalleryAlbumSummaryResponse(GalleryAlbumBase):
+    id: int
+    uploader_id: int
+    uploader_name: Optional[str] = None
+    created_at: datetime
+    item_count: int = 0
+    cover_item: Optional[GalleryCoverItem] = None
+
 # 입부신청 관련 스키마
 class ApplicationBase(BaseModel):
     motivation: str
@@ -118,6 +165,11 @@ class ApplicationBase(BaseModel):
     instrument: Optional[str] = None
     form_data: Optional[str] = None  # JSON 문자열
 
+    @field_validator("form_data", mode="before")
+    @classmethod
+    def _form_data_text(cls, value):
+        return json_text(value)
+
 class ApplicationCreate(ApplicationBase):
     pass
 
@@ -154,6 +206,11 @@ class IntegratedApplicationCreate(BaseModel):
     instrument: Optional[str] = None
     form_data: Optional[str] = None  # JSON 문자열
 
+    @field_validator("form_data", mode="before")
+    @classmethod
+    def _form_data_text(cls, value):
+        return _validate_json_text(json_text(value))
+
 # 신청 양식 질문 스키마
 class FormQuestion(BaseModel):
     id: int
@@ -171,11 +228,19 @@ class ApplicationFormBase(BaseModel):
     current_applicants: int = 0
     form_questions: Optional[str] = None  # JSON 문자열
 
+    @field_validator("form_questions", mode="before")
+    @classmethod
+    def _form_questions_text(cls, value):
+        return json_text(value)
+
 class ApplicationFormCreate(ApplicationFormBase):
     pass
 
 class ApplicationFormUpdate(ApplicationFormBase):
-    pass
+    @field_validator("form_questions")
+    @classmethod
+    def _form_questions_json(cls, value):
+        return _validate_json_text(value)
 
 class ApplicationFormResponse(ApplicationFormBase):
     id: int
@@ -227,10 +292,26 @@ class CommentResponse(CommentBase):
     class Config:
         from_attributes = True
 
+# 통합 검색 스키마
+class SearchResultResponse(BaseModel):
+    type: str  # post, comment, album
+    id: int
+    post_id: Optional[int] = None  # 게시글/댓글이 속한 게시글 ID
+    title: str  # 댓글이면 게시글 제목
+    title_highlight: str  # HTML 이스케이프 + 검색어 <mark> 표시
+    snippet: str  # 본문 중 검색어 주변 (HTML 이스케이프 + <mark>)
+    category: Optional[str] = None
+    created_at: datetime
+    score: float
+
 # 토큰 관련 스키마
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 class TokenData(BaseModel):
     email: Optional[str] = None
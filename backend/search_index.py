@@ -0,0 +1,223 @@
+"""
+통합 검색 인덱스 (게시글 / 댓글 / 갤러리 앨범)
+한국어는 조사가 단어에 붙어("세션구인을") 띄어쓰기 단위 토큰화로는 검색되지 않으므로 3글자(trigram) 단위로 색인합니다.
+- SQLite: FTS5 trigram 토크나이저 (external content 테이블 + 트리거로 쓰기마다 자동 반영, bm25 순위)
+- PostgreSQL: pg_trgm GIN 인덱스 (ILIKE 검색, word_similarity 순위, 인덱스는 DB가 쓰기마다 갱신)
+둘 다 사용할 수 없으면 LIKE 검색(최신순)으로 동작합니다.
+"""
+import html
+import logging
+import re
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Integer, cast, column, func, literal_column, null, or_, select, table, text, union_all
+from sqlalchemy.exc import DBAPIError
+
+from models import Comment, GalleryAlbum, Post
+
+logger = logging.getLogger(__name__)
+
+# FTS5 trigram은 3글자 이상 검색어만 색인으로 찾을 수 있음 (더 짧은 검색어는 LIKE로 보완)
+TRIGRAM_MIN_LENGTH = 3
+# 검색어 최대 개수 (공백 기준)
+MAX_TERMS = 8
+# 결과 미리보기 길이
+SNIPPET_LENGTH = 120
+
+# 검색 대상: 종류 -> (테이블, 색인 컬럼, 컬럼별 순위 가중치)
+SEARCH_SOURCES = {
+    "post": ("posts", ("title", "content"), (10.0, 1.0)),
+    "comment": ("comments", ("content",), (1.0,)),
+    "album": ("gallery_albums", ("title", "description"), (10.0, 1.0)),
+}
+SEARCH_TYPES = tuple(SEARCH_SOURCES)
+
+
+def _sqlite_ddl(source_table: str, columns: Sequence[str]) -> List[str]:
+    fts = f"{source_table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{source_table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source_table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source_table} BEGIN {delete_old} END",
+        # 색인 컬럼이 바뀔 때만 재색인 (고정/댓글 수 변경 등은 건너뜀)
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {source_table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+class SearchIndex:
+    """검색 방식(fts5 / trigram / like) 결정과 검색 쿼리 생성"""
+
+    def __init__(self):
+        self.mode = "like"
+
+    def ensure(self, engine, rebuild: bool = False):
+        """검색 인덱스 생성 (여러 번 실행해도 안전, 서버 시작 시 호출)"""
+        try:
+            if engine.dialect.name == "sqlite":
+                self._ensure_sqlite(engine, rebuild)
+            elif engine.dialect.name == "postgresql":
+                self._ensure_postgres(engine)
+        except DBAPIError as e:
+            logger.warning("검색 인덱스를 만들 수 없어 LIKE 검색을 사용합니다: %s", e)
+            self.mode = "like"
+        logger.info("검색 방식: %s", self.mode)
+
+    def _ensure_sqlite(self, engine, rebuild: bool):
+        with engine.begin() as connection:
+            for source_table, columns, _ in SEARCH_SOURCES.values():
+                fts = f"{source_table}_fts"
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": fts}
+                ).first()
+                for statement in _sqlite_ddl(source_table, columns):
+                    connection.execute(text(statement))
+                if rebuild or not exists:
+                    # 새로 만든 인덱스에 기존 데이터 채우기
+                    connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        self.mode = "fts5"
+
+    def _ensure_postgres(self, engine):
+        # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 autocommit 사용 (쓰기 요청을 막지 않음)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            try:
+                connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            except DBAPIError as e:
+                logger.warning("pg_trgm 확장을 설치할 수 없습니다: %s", e)
+            installed = connection.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first()
+            if not installed:
+                self.mode = "like"
+                return
+            for source_table, columns, _ in SEARCH_SOURCES.values():
+                for col in columns:
+                    connection.execute(text(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{source_table}_{col}_trgm "
+                        f"ON {source_table} USING gin ({col} gin_trgm_ops)"
+                    ))
+        self.mode = "trigram"
+
+    def _source_query(self, kind: str, query: str, terms: List[str]):
+        """검색 대상 하나에 대한 SELECT (type, id, post_id, title, body, category, created_at, score)"""
+        source_table, columns, weights = SEARCH_SOURCES[kind]
+        if kind == "post":
+            fields = (Post.id, Post.id, Post.title, Post.content, Post.category, Post.created_at)
+            searched = (Post.title, Post.content)
+        elif kind == "comment":
+            fields = (Comment.id, Comment.post_id, Post.title, Comment.content, Post.category, Comment.created_at)
+            searched = (Comment.content,)
+        else:
+            fields = (
+                GalleryAlbum.id, cast(null(), Integer), GalleryAlbum.title, GalleryAlbum.description,
+                GalleryAlbum.category, GalleryAlbum.created_at,
+            )
+            searched = (GalleryAlbum.title, GalleryAlbum.description)
+        base = searched[0].class_
+
+        long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+        use_fts = self.mode == "fts5" and long_terms
+        like_terms = [t for t in terms if not use_fts or len(t) < TRIGRAM_MIN_LENGTH]
+
+        if use_fts:
+            fts = table(f"{source_table}_fts", column("rowid"))
+            fts_ref = literal_column(f"{source_table}_fts")
+            # bm25는 값이 작을수록 관련도가 높음
+            score = -func.bm25(fts_ref, *(literal_column(str(w)) for w in weights))
+        elif self.mode == "trigram":
+            similarities = [
+                literal_column(str(weight)) * func.word_similarity(query, func.coalesce(col, ""))
+                for weight, col in zip(weights, searched)
+            ]
+            score = similarities[0]
+            for similarity in similarities[1:]:
+                score = score + similarity
+        else:
+            score = literal_column("0.0")
+
+        # 상수는 바인드 파라미터 대신 SQL 리터럴로 (asyncpg가 UNION 안의 파라미터 타입을 추론하지 못함)
+        stmt = select(
+            literal_column(f"'{kind}'").label("type"),
+            fields[0].label("id"),
+            fields[1].label("post_id"),
+            fields[2].label("title"),
+            fields[3].label("body"),
+            fields[4].label("category"),
+            fields[5].label("created_at"),
+            score.label("score"),
+        )
+        if use_fts:
+            stmt = stmt.select_from(fts).join(base, base.id == fts.c.rowid)
+            stmt = stmt.where(fts_ref.op("MATCH")(" ".join(_fts_phrase(t) for t in long_terms)))
+        else:
+            stmt = stmt.select_from(base)
+        if kind == "comment":
+            stmt = stmt.join(Post, Post.id == Comment.post_id)
+
+        operator = "ilike" if self.mode == "trigram" else "like"
+        for term in like_terms:
+            pattern = f"%{_escape_like(term)}%"
+            stmt = stmt.where(or_(*(getattr(col, operator)(pattern, escape="\\") for col in searched)))
+        return stmt
+
+    def build(self, query: str, terms: List[str], types: Sequence[str]):
+        """종류별 검색 결과를 합친 서브쿼리 (정렬/페이지는 호출하는 쪽에서)"""
+        return union_all(*(self._source_query(kind, query, terms) for kind in types)).subquery("results")
+
+
+def _fts_phrase(term: str) -> str:
+    # FTS5 문법 문자(연산자, 괄호 등)를 그대로 검색하도록 큰따옴표로 감쌈
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def split_terms(query: str) -> List[str]:
+    """공백 기준 검색어 목록 (중복 제거, 최대 MAX_TERMS개)"""
+    terms = []
+    for term in query.split():
+        if term.lower() not in (t.lower() for t in terms):
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def highlight(value: Optional[str], terms: List[str], length: Optional[int] = None) -> str:
+    """HTML 이스케이프 후 검색어를 <mark>로 감쌈 (length를 주면 첫 일치 위치 주변만 잘라냄)"""
+    if not value:
+        return ""
+    if length is not None and len(value) > length:
+        lowered = value.lower()
+        positions = [p for p in (lowered.find(t.lower()) for t in terms) if p >= 0]
+        start = max(0, min(positions) - length // 3) if positions else 0
+        end = min(len(value), start + length)
+        value = ("…" if start > 0 else "") + value[start:end] + ("…" if end < len(value) else "")
+
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    parts = []
+    last = 0
+    for match in pattern.finditer(value):
+        parts.append(html.escape(value[last:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        last = match.end()
+    parts.append(html.escape(value[last:]))
+    return "".join(parts)
+
+
+search_index = SearchIndex()
+
+
+if __name__ == "__main__":
+    # 검색 인덱스 수동 재구성: python search_index.py
+    from database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    search_index.ensure(engine, rebuild=True)
+    print(f"검색 인덱스 준비 완료 (방식: {search_index.mode})")
@@ -0,0 +1,176 @@
+"""
+요청 단위 SQL 계측
+SQLAlchemy 엔진 이벤트로 요청별 쿼리 수/DB 시간/가장 느린 쿼리를 수집하고,
+느린 요청 로그, Server-Timing 헤더, 라우트별 누적 통계를 제공합니다.
+"""
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# 요청 전체 DB 시간이 이 값(밀리초)을 넘으면 느린 요청으로 기록
+SLOW_REQUEST_DB_MS = float(os.getenv("SLOW_REQUEST_DB_MS", "200"))
+# 로그에 남길 SQL 문 최대 길이
+MAX_STATEMENT_LENGTH = 500
+# 일치하는 라우트가 없는 요청을 모아 집계할 경로 이름
+UNMATCHED_ROUTE = "<unmatched>"
+# 통계 키에 그대로 쓰는 HTTP 메서드 (그 밖의 임의 메서드는 OTHER로 묶음)
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+_current_stats: ContextVar[Optional["RequestQueryStats"]] = ContextVar("request_query_stats", default=None)
+
+
+class RequestQueryStats:
+    """한 요청 동안 실행된 쿼리 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float):
+        # 동기 의존성은 스레드풀에서 실행되므로 잠금 필요
+        with self._lock:
+            self.query_count += 1
+            self.db_time_ms += elapsed_ms
+            if elapsed_ms > self.slowest_ms:
+                self.slowest_ms = elapsed_ms
+                self.slowest_statement = statement
+
+    def server_timing(self, total_ms: float) -> str:
+        return (
+            f'db;dur={self.db_time_ms:.1f};desc="{self.query_count} queries", '
+            f"app;dur={total_ms:.1f}"
+        )
+
+
+class RouteStats:
+    """라우트별 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route_key: str, stats: RequestQueryStats, total_ms: float):
+        with self._lock:
+            entry = self._routes.get(route_key)
+            if entry is None:
+                entry = self._routes[route_key] = {
+                    "requests": 0,
+                    "queries": 0,
+                    "db_time_ms": 0.0,
+                    "total_time_ms": 0.0,
+                    "max_db_time_ms": 0.0,
+                    "max_queries": 0,
+                    "slow_requests": 0,
+                    "slowest_statement": None,
+                    "slowest_statement_ms": 0.0,
+                }
+            entry["requests"] += 1
+            entry["queries"] += stats.query_count
+            entry["db_time_ms"] += stats.db_time_ms
+            entry["total_time_ms"] += total_ms
+            entry["max_db_time_ms"] = max(entry["max_db_time_ms"], stats.db_time_ms)
+            entry["max_queries"] = max(entry["max_queries"], stats.query_count)
+            if stats.db_time_ms >= SLOW_REQUEST_DB_MS:
+                entry["slow_requests"] += 1
+            if stats.slowest_ms > entry["slowest_statement_ms"]:
+                entry["slowest_statement_ms"] = stats.slowest_ms
+                entry["slowest_statement"] = stats.slowest_statement
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for route_key, entry in self._routes.items():
+                requests = entry["requests"] or 1
+                result[route_key] = {
+                    **entry,
+                    "db_time_ms": round(entry["db_time_ms"], 3),
+                    "total_time_ms": round(entry["total_time_ms"], 3),
+                    "max_db_time_ms": round(entry["max_db_time_ms"], 3),
+                    "slowest_statement_ms": round(entry["slowest_statement_ms"], 3),
+                    "avg_queries": round(entry["queries"] / requests, 2),
+                    "avg_db_time_ms": round(entry["db_time_ms"] / requests, 3),
+                    "avg_total_time_ms": round(entry["total_time_ms"] / requests, 3),
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement[:MAX_STATEMENT_LENGTH], elapsed_ms)
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 여기서 시작 시각을 꺼냄
+    # (남겨두면 풀에 반환된 연결의 다음 쿼리 시간이 잘못 계산됨)
+    # 실행 컨텍스트(커서) 생성 전에 실패했다면 before_cursor_execute도 호출되지 않았음
+    conn = exception_context.connection
+    if conn is None or exception_context.execution_context is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None and exception_context.statement:
+        stats.record(exception_context.statement[:MAX_STATEMENT_LENGTH], elapsed_ms)
+
+
+def instrument_engine(engine):
+    """엔진에 쿼리 계측 이벤트 등록 (AsyncEngine은 sync_engine에 등록)"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+    return engine
+
+
+def route_method(method: str) -> str:
+    """통계 키용 HTTP 메서드 (클라이언트가 임의 메서드로 통계 항목을 늘리지 못하도록)"""
+    return method if method in KNOWN_METHODS else "OTHER"
+
+
+def begin_request() -> RequestQueryStats:
+    """요청 시작 시 호출 - 이후 실행되는 쿼리를 이 요청에 집계"""
+    stats = RequestQueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def end_request(stats: RequestQueryStats, method: str, path: str, total_ms: float):
+    """요청 종료 시 호출 - 라우트 통계 누적 및 느린 요청 로그"""
+    route_key = f"{method} {path}"
+    route_stats.record(route_key, stats, total_ms)
+    if stats.db_time_ms >= SLOW_REQUEST_DB_MS:
+        logger.warning(
+            "느린 요청: %s - 쿼리 %d회, DB %.1fms, 전체 %.1fms, 가장 느린 쿼리 %.1fms: %s",
+            route_key, stats.query_count, stats.db_time_ms, total_ms,
+            stats.slowest_ms, stats.slowest_statement
+        )
+    _current_stats.set(None)
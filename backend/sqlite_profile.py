@@ -0,0 +1,47 @@
+"""
+SQLite 운영용 성능 프로필
+SQLITE_PERFORMANCE_PROFILE=true 일 때 모든 연결에 WAL/mmap/busy_timeout 등의 PRAGMA를 적용합니다.
+"""
+import os
+
+from sqlalchemy import event
+
+from db_pool import env_bool
+
+# 프로필 사용 여부 (기본 비활성화)
+SQLITE_PROFILE_ENABLED = env_bool("SQLITE_PERFORMANCE_PROFILE", False)
+
+# 연결마다 적용할 PRAGMA (환경변수로 개별 조정 가능)
+SQLITE_PRAGMAS = {
+    # 읽기와 쓰기가 서로 막지 않도록 WAL 저널 사용
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    # WAL 모드에서는 NORMAL로도 DB 손상은 없음 (전원 장애 시 마지막 커밋 일부만 유실 가능)
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    # 메모리 맵 I/O 크기 (바이트, 기본 256MB)
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # 페이지 캐시 크기 (음수면 KiB 단위, 기본 64MB)
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024))),
+    # 잠금 대기 시간 (밀리초) - "database is locked" 대신 대기 후 재시도
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+    "temp_store": "MEMORY",
+    # 외래 키 검사 (기본 OFF) - 앨범 작성자, 지원서 검토자(reviewed_by), 지원서 양식 수정자(updated_by) 등
+    # 사용자를 참조하는 컬럼이 남아 있으면 회원 탈퇴/거부가 실패하므로, 모든 참조를 정리한 뒤에만 ON으로 사용
+    "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "OFF"),
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def apply_sqlite_profile(engine):
+    """엔진의 모든 신규 연결에 성능 PRAGMA 적용 (AsyncEngine은 sync_engine에 등록)"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "connect", _set_sqlite_pragmas):
+        event.listen(target, "connect", _set_sqlite_pragmas)
+    return engine
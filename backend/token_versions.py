@@ -0,0 +1,68 @@
+"""
+사용자별 토큰 버전 맵
+토큰에는 발급 시점의 token_version이 들어가고, 승인/권한 변경/삭제 시 DB의 버전이 올라가면
+이전에 발급된 토큰은 더 이상 통과하지 못합니다.
+같은 프로세스에서 올린 버전은 즉시 반영되고, 다른 프로세스의 변경은 짧은 주기로 DB에서 다시 읽습니다.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# 삭제되었거나 존재하지 않는 사용자 (어떤 토큰도 통과하지 못함)
+REVOKED = -1
+
+
+class TokenVersionMap:
+    """user_id -> (token_version, 확인 시각)"""
+
+    def __init__(self, refresh_seconds: float, maxsize: int):
+        self.refresh_seconds = refresh_seconds
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._versions: Dict[int, Tuple[int, float]] = {}
+        self.hits = 0
+        self.refreshes = 0
+        self.rejections = 0
+
+    def set(self, user_id: int, version: int):
+        with self._lock:
+            if len(self._versions) >= self.maxsize and user_id not in self._versions:
+                # 맵이 가득 차면 비움 (다음 요청에서 DB로 다시 채워짐)
+                self._versions.clear()
+            self._versions[user_id] = (version, time.monotonic())
+
+    def current(self, user_id: int, load: Callable[[int], Optional[int]], force: bool = False) -> int:
+        """현재 유효한 버전 (오래된 항목이거나 force면 load로 DB에서 다시 읽음)"""
+        with self._lock:
+            entry = self._versions.get(user_id)
+        if not force and entry is not None and time.monotonic() - entry[1] < self.refresh_seconds:
+            self.hits += 1
+            return entry[0]
+        self.refreshes += 1
+        version = load(user_id)
+        version = REVOKED if version is None else version
+        self.set(user_id, version)
+        return version
+
+    def is_valid(self, user_id: int, version: int, load: Callable[[int], Optional[int]]) -> bool:
+        current = self.current(user_id, load)
+        if version > current:
+            # 다른 프로세스에서 버전을 올린 뒤 발급된 토큰일 수 있음 - 캐시를 믿지 않고 DB에서 다시 확인
+            current = self.current(user_id, load, force=True)
+        if version == current:
+            return True
+        # DB 기준으로 이전 버전인 토큰만 거부
+        self.rejections += 1
+        return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._versions)
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "refresh_seconds": self.refresh_seconds,
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "rejections": self.rejections,
+        }
@@ -39,14 +39,60 @@ api.interceptors.request.use(
   }
 )
 
+// 리프레시 토큰으로 액세스 토큰 재발급 (동시에 여러 요청이 401을 받아도 한 번만 요청)
+let refreshPromise: Promise<string> | null = null
+
+const refreshAccessToken = (): Promise<string> => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token')
+    refreshPromise = (async () => {
+      if (!refreshToken) {
+        throw new Error('리프레시 토큰 없음')
+      }
+      try {
+        // 인터셉터를 거치지 않도록 기본 axios로 요청
+        const response = await axios.post(`${baseURL}/auth/refresh`, { refresh_token: refreshToken })
+        const { access_token, refresh_token } = response.data
+        localStorage.setItem('token', access_token)
+        localStorage.setItem('refresh_token', refresh_token)
+        api.defaults.headers.common['Authorization'] = `Bearer ${access_token}`
+        return access_token
+      } catch (error) {
+        // 다른 탭에서 먼저 갱신했다면 그 토큰을 사용
+        const latestToken = localStorage.getItem('token')
+        if (localStorage.getItem('refresh_token') !== refreshToken && latestToken) {
+          return latestToken
+        }
+        throw error
+      }
+    })().finally(() => {
+      refreshPromise = null
+    })
+  }
+  return refreshPromise
+}
+
 // 응답 인터셉터
 api.interceptors.response.use(
   (response) => {
     return response
   },
-  (error) => {
+  async (error) => {
+    const originalRequest = error.config
+    const isAuthRequest = originalRequest?.url?.startsWith('/auth/login') || originalRequest?.url?.startsWith('/auth/refresh')
+    if (error.response?.status === 401 && originalRequest && !originalRequest._retry && !isAuthRequest) {
+      originalRequest._retry = true
+      try {
+        const accessToken = await refreshAccessToken()
+        originalRequest.headers.Authorization = `Bearer ${accessToken}`
+        return api(originalRequest)
+      } catch (refreshError) {
+        // 갱신 실패 시 아래에서 로그인 페이지로 이동
+      }
+    }
     if (error.response?.status === 401) {
       localStorage.removeItem('token')
+      localStorage.removeItem('refresh_token')
       window.location.href = '/login'
     }
     return Promise.reject(error)
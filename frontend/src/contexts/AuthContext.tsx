@@ -61,6 +61,7 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
           setToken(storedToken)
         } catch (error) {
           localStorage.removeItem('token')
+          localStorage.removeItem('refresh_token')
           delete api.defaults.headers.common['Authorization']
         }
       }
@@ -73,9 +74,10 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
   const login = async (email: string, password: string) => {
     try {
       const response = await api.post('/auth/login', { email, password })
-      const { access_token } = response.data
+      const { access_token, refresh_token } = response.data
       
       localStorage.setItem('token', access_token)
+      localStorage.setItem('refresh_token', refresh_token)
       api.defaults.headers.common['Authorization'] = `Bearer ${access_token}`
       
       const userResponse = await api.get('/auth/me')
@@ -95,7 +97,13 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
   }
 
   const logout = () => {
+    // 서버에서 리프레시 토큰 폐기 (실패해도 로그아웃은 진행)
+    const refreshToken = localStorage.getItem('refresh_token')
+    if (refreshToken) {
+      api.post('/auth/logout', { refresh_token: refreshToken }).catch(() => {})
+    }
     localStorage.removeItem('token')
+    localStorage.removeItem('refresh_token')
     delete api.defaults.headers.common['Authorization']
     setUser(null)
     setToken(null)
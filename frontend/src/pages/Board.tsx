@@ -7,20 +7,17 @@ import { Plus, MessageSquare, Pin, Clock, User, ChevronLeft, ChevronRight } from
 import { format } from 'date-fns'
 import { ko } from 'date-fns/locale'
 
-interface Post {
+interface PostSummary {
   id: number
   title: string
-  content: string
+  excerpt: string
   category: string
   author_id: number
+  author_name: string | null
+  comment_count: number
   is_pinned: boolean
   created_at: string
   updated_at: string
-  author: {
-    id: number
-    username: string
-    real_name: string
-  }
 }
 
 const Board = () => {
@@ -62,7 +59,10 @@ const Board = () => {
         limit: postsPerPage,
         ...(selectedCategory && { category: selectedCategory })
       }
-      const response = await api.get('/posts', { params })
+      // 목록에는 요약 정보만 필요하므로 요약 API 사용 (전체 게시글 수는 X-Total-Count 헤더)
+      const response = await api.get('/posts/summary', { params })
+      const total = Number(response.headers['x-total-count'])
+      setTotalPosts(Number.isNaN(total) ? 0 : total)
       // API 응답이 배열인지 확인하고, 아니면 빈 배열 반환
       return Array.isArray(response.data) ? response.data : []
     },
@@ -76,37 +76,11 @@ const Board = () => {
     }
   )
 
-  // 전체 게시글 수 조회
-  const { data: allPosts } = useQuery(
-    ['posts-count', selectedCategory],
-    async () => {
-      const params = selectedCategory ? { category: selectedCategory, limit: 1000 } : { limit: 1000 }
-      const response = await api.get('/posts', { params })
-      // API 응답이 배열인지 확인하고, 아니면 빈 배열 반환
-      return Array.isArray(response.data) ? response.data : []
-    },
-    {
-      retry: false, // 403 오류 시 재시도하지 않음
-      onError: (error: any) => {
-        if (error.response?.status === 403) {
-          console.log('게시글 수 조회 권한이 없습니다.')
-        }
-      }
-    }
-  )
-
   // 카테고리 변경 시 첫 페이지로 이동
   useEffect(() => {
     setCurrentPage(1)
   }, [selectedCategory])
 
-  // 전체 게시글 수 업데이트
-  useEffect(() => {
-    if (allPosts && Array.isArray(allPosts)) {
-      setTotalPosts(allPosts.length)
-    }
-  }, [allPosts])
-
   const totalPages = Math.ceil(totalPosts / postsPerPage)
 
   const handlePageChange = (page: number) => {
@@ -191,7 +165,7 @@ const Board = () => {
           {posts && Array.isArray(posts) && posts.length > 0 ? (
             <>
               <div className="divide-y divide-[#2A2A2A]">
-                {posts.map((post: Post) => (
+                {posts.map((post: PostSummary) => (
                   <Link
                     key={post.id}
                     to={`/board/${post.id}`}
@@ -216,7 +190,7 @@ const Board = () => {
                         <div className="flex items-center space-x-4 text-sm text-[#6DD3C7]">
                           <div className="flex items-center space-x-1">
                             <User className="w-4 h-4" />
-                            <span>{post.author.username}</span>
+                            <span>{post.author_name}</span>
                           </div>
                           <div className="flex items-center space-x-1">
                             <Clock className="w-4 h-4" />
@@ -227,6 +201,7 @@ const Board = () => {
                       
                       <div className="flex items-center space-x-1 text-[#6DD3C7]">
                         <MessageSquare className="w-4 h-4" />
+                        <span className="text-sm">{post.comment_count}</span>
                       </div>
                     </div>
                   </Link>
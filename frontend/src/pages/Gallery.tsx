@@ -8,34 +8,22 @@ import { ko } from 'date-fns/locale'
 import toast from 'react-hot-toast'
 import { Link } from 'react-router-dom'
 
-interface GalleryAlbum {
+interface GalleryAlbumSummary {
   id: number
   title: string
   description: string
   category: string
   uploader_id: number
+  uploader_name: string | null
   created_at: string
-  uploader: {
-    id: number
-    username: string
-    real_name: string
-  }
-  items: GalleryItem[]
+  item_count: number
+  cover_item: GalleryCoverItem | null
 }
 
-interface GalleryItem {
+interface GalleryCoverItem {
   id: number
-  title: string
   file_path: string
   file_type: string
-  album_id: number
-  uploader_id: number
-  created_at: string
-  uploader: {
-    id: number
-    username: string
-    real_name: string
-  }
 }
 
 const Gallery = () => {
@@ -72,7 +60,8 @@ const Gallery = () => {
     ['gallery', selectedCategory],
     async () => {
       const params = selectedCategory ? { category: selectedCategory } : {}
-      const response = await api.get('/gallery', { params })
+      // 목록에는 대표 이미지와 아이템 수만 필요하므로 요약 API 사용
+      const response = await api.get('/gallery/summary', { params })
       // API 응답이 배열인지 확인하고, 아니면 빈 배열 반환
       return Array.isArray(response.data) ? response.data : []
     },
@@ -186,15 +175,15 @@ const Gallery = () => {
         {/* 갤러리 그리드 */}
         {albums && Array.isArray(albums) && albums.length > 0 ? (
           <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-8">
-            {albums.map((album: GalleryAlbum) => (
+            {albums.map((album: GalleryAlbumSummary) => (
               <div key={album.id} className="bg-[#121212] border border-[#2A2A2A] rounded-2xl overflow-hidden group shadow-sm hover:shadow-lg hover:bg-[#1A1A1A] transition-all duration-500">
                 <Link to={`/gallery/${album.id}`}>
                   <div className="relative aspect-square bg-gradient-to-br from-[#2A2A2A] to-[#1A1A1A]">
-                    {album.items && album.items.length > 0 ? (
+                    {album.cover_item ? (
                       <>
-                        {album.items[0].file_type === 'image' ? (
+                        {album.cover_item.file_type === 'image' ? (
                           <img
-                            src={`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/static/gallery/${album.id}/${album.items[0].file_path.split('/').pop()}`}
+                            src={`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/static/gallery/${album.id}/${album.cover_item.file_path.split('/').pop()}`}
                             alt={album.title}
                             className="w-full h-full object-cover group-hover:scale-110 transition-all duration-700 ease-out"
                             onError={(e) => {
@@ -209,10 +198,10 @@ const Gallery = () => {
                         )}
                         
                          {/* 사진 개수 표시 */}
-                         {album.items.length > 1 && (
+                         {album.item_count > 1 && (
                            <div className="absolute top-3 right-3 bg-[#1A1A1A]/90 backdrop-blur-sm text-[#6DD3C7] px-3 py-1.5 rounded-full text-sm flex items-center shadow-sm border border-[#2A2A2A]">
                              <Grid3X3 className="w-4 h-4 mr-1" />
-                             {album.items.length}
+                             {album.item_count}
                            </div>
                          )}
                       </>
@@ -256,7 +245,7 @@ const Gallery = () => {
                   <div className="flex items-center justify-between text-xs text-[#6DD3C7] pt-2 border-t border-[#2A2A2A]">
                     <div className="flex items-center space-x-1">
                       <User className="w-3 h-3 text-[#6DD3C7]" />
-                      <span className="font-medium">{album.uploader.username}</span>
+                      <span className="font-medium">{album.uploader_name}</span>
                     </div>
                     <div className="flex items-center space-x-1">
                       <Clock className="w-3 h-3 text-[#6DD3C7]" />
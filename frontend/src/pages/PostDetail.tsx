@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useParams, useNavigate, Link } from 'react-router-dom'
-import { useQuery, useMutation, useQueryClient } from 'react-query'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from 'react-query'
 import { api } from '../api'
 import { useAuth } from '../contexts/AuthContext'
 import { ArrowLeft, Edit, Trash2, Pin, PinOff, MessageSquare, Clock, User } from 'lucide-react'
@@ -38,6 +38,15 @@ interface Comment {
   }
 }
 
+interface CommentPage {
+  comments: Comment[]
+  nextCursor?: string
+  total: number
+}
+
+// 한 번에 불러올 댓글 수 (최신 댓글부터, 이전 댓글은 '더 보기'로 로드)
+const COMMENT_PAGE_SIZE = 50
+
 const PostDetail = () => {
   const { id } = useParams<{ id: string }>()
   const navigate = useNavigate()
@@ -65,17 +74,34 @@ const PostDetail = () => {
   )
 
   // 댓글 목록 조회
-  const { data: comments, isLoading: commentsLoading } = useQuery(
+  const {
+    data: commentPages,
+    isLoading: commentsLoading,
+    fetchNextPage: fetchOlderComments,
+    hasNextPage: hasOlderComments,
+    isFetchingNextPage: isFetchingOlderComments
+  } = useInfiniteQuery(
     ['comments', id],
-    async () => {
-      const response = await api.get(`/posts/${id}/comments`)
-      return response.data as Comment[]
+    async ({ pageParam }): Promise<CommentPage> => {
+      const response = await api.get(`/posts/${id}/comments`, {
+        params: { latest: true, limit: COMMENT_PAGE_SIZE, cursor: pageParam }
+      })
+      const comments = response.data as Comment[]
+      return {
+        comments,
+        nextCursor: response.headers['x-next-cursor'] || undefined,
+        total: Number(response.headers['x-total-count'] ?? comments.length)
+      }
     },
     {
       enabled: !!id && !!user?.is_approved,
-      retry: false
+      retry: false,
+      getNextPageParam: (lastPage) => lastPage.nextCursor
     }
   )
+  // 나중에 불러온(더 오래된) 페이지가 위에 오도록 역순으로 합침
+  const comments = commentPages ? [...commentPages.pages].reverse().flatMap((page) => page.comments) : undefined
+  const commentTotal = commentPages?.pages[0]?.total ?? 0
 
   const deleteMutation = useMutation(
     async () => {
@@ -413,7 +439,7 @@ const PostDetail = () => {
           <div className="flex items-center mb-6">
             <MessageSquare className="w-6 h-6 text-[#6DD3C7] mr-2" />
             <h3 className="text-lg font-semibold text-[#EAEAEA]">댓글</h3>
-            <span className="ml-2 text-[#B0B0B0]">({comments?.length || 0})</span>
+            <span className="ml-2 text-[#B0B0B0]">({commentTotal})</span>
           </div>
 
           {/* 댓글 작성 */}
@@ -444,6 +470,15 @@ const PostDetail = () => {
             </div>
           ) : comments && comments.length > 0 ? (
             <div className="space-y-4">
+              {hasOlderComments && (
+                <button
+                  onClick={() => fetchOlderComments()}
+                  disabled={isFetchingOlderComments}
+                  className="w-full py-2 text-sm text-[#6DD3C7] border border-[#2A2A2A] rounded-lg hover:bg-[#1A1A1A] disabled:opacity-50 transition-colors"
+                >
+                  {isFetchingOlderComments ? '불러오는 중...' : `이전 댓글 더 보기 (${commentTotal - comments.length}개)`}
+                </button>
+              )}
               {comments.map((comment) => (
                 <div key={comment.id} className="bg-[#1A1A1A] border border-[#2A2A2A] rounded-lg p-4">
                   <div className="flex items-start justify-between mb-2">